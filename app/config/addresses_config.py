@@ -13,3 +13,5 @@ CONNECTORS = {
     "moonwell": MOONWELL_CONNECTOR,
     "morpho": MORPHO_CONNECTOR,
 }
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
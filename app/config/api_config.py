@@ -0,0 +1,5 @@
+API_ENDPOINTS = {
+    "DEFI_LLAMA": "https://api.llama.fi",
+    "COINS_API": "https://coins.llama.fi",
+    "YIELDS_API": "https://yields.llama.fi",
+}
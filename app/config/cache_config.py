@@ -0,0 +1,15 @@
+# Freshness windows (seconds) for coins.llama.fi data. Within "ttl" a cached
+# value is served as-is; for a further "stale_ttl" it is served immediately
+# while a background refresh runs.
+PRICE_CACHE_TTLS = {
+    "current": {"ttl": 30, "stale_ttl": 300},
+    "24h": {"ttl": 300, "stale_ttl": 1800},
+    "7d": {"ttl": 1800, "stale_ttl": 3600},
+    "30d": {"ttl": 3600, "stale_ttl": 6 * 3600},
+}
+
+# Embedding vectors cached by model and content hash: an in-memory LRU tier of
+# this many vectors in front of an on-disk SQLite tier.
+EMBEDDING_CACHE_CONFIG = {
+    "max_memory_items": 2048,
+}
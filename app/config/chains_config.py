@@ -0,0 +1,37 @@
+import os
+
+from app.config.addresses_config import BASE_TOKENS
+
+# Chains market data is ingested for. Each entry names the chain as DeFi Llama
+# spells it (``llama_name`` in yields/TVL, ``coin_prefix`` in coin ids), the
+# env vars holding its RPC endpoints, and the tokens tracked on it.
+CHAINS = {
+    "base": {
+        "llama_name": "Base",
+        "coin_prefix": "base",
+        "chain_id": 8453,
+        "rpc_env": "BASE_RPC_URL",
+        "ws_env": "BASE_WS_URL",
+        "tokens": BASE_TOKENS,
+    },
+    "optimism": {
+        "llama_name": "Optimism",
+        "coin_prefix": "optimism",
+        "chain_id": 10,
+        "rpc_env": "OPTIMISM_RPC_URL",
+        "ws_env": "OPTIMISM_WS_URL",
+        "tokens": {
+            "USDC": "0x0b2C639c533813f4Aa9D7837CAf62653d097Ff85",
+            "WETH": "0x4200000000000000000000000000000000000006",
+        },
+    },
+}
+
+DEFAULT_CHAIN = "base"
+
+# Comma-separated chain keys ingested by the market job. A chain gets a
+# snapshot only once some protocol adapter lists it in its ``chains``; the
+# built-in adapters read Base contracts only.
+ENABLED_CHAINS = [
+    chain.strip() for chain in os.getenv("MARKET_CHAINS", DEFAULT_CHAIN).split(",") if chain.strip() in CHAINS
+]
@@ -0,0 +1,27 @@
+HTTP_CONFIG = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 60.0,
+    "max_connections_per_host": 10,
+    "http2": True,
+}
+
+RESILIENCE_CONFIG = {
+    "backoff_base": 0.5,
+    "backoff_cap": 30.0,
+    "retry_status_codes": [429, 500, 502, 503, 504],
+    "breaker_failure_threshold": 5,
+    "breaker_reset_timeout": 30.0,
+    # Retries may add at most this fraction of extra load on top of first attempts.
+    "retry_budget_ratio": 0.2,
+    "retry_budget_min_per_second": 1.0,
+    # After a failed Web3 connect, lookups for that chain fail fast for this long.
+    "rpc_connect_cooldown": 30.0,
+}
+
+# Token-bucket limits per host: sustained requests per second and burst size.
+RATE_LIMITS = {
+    "api.llama.fi": {"rate": 5.0, "burst": 10},
+    "coins.llama.fi": {"rate": 5.0, "burst": 10},
+    "yields.llama.fi": {"rate": 2.0, "burst": 5},
+}
@@ -19,4 +19,43 @@ PROTOCOLS_CONFIG = {
             "REPAY"
         ]
     },
+    "morpho": {
+        "name": "Morpho",
+        "type": "VAULT",
+        "addresses": {
+            "vaults": {
+                "mwUSDC": "0xc1256Ae5FF1cf2719D4937adb3bbCCab2E00A2Ca",
+                "mwETH": "0xa0E430870c4604CcfC7B38Ca7845B1FF653D0ff1",
+                "steakUSDC": "0xbeeF010f9cb27031ad51e3333f9aF9C6B1228183",
+            }
+        },
+        "supportedActions": [
+            "SUPPLY",
+            "WITHDRAW"
+        ]
+    },
    }
+
+# Market data adapters: per-provider deadline (seconds) and the DeFi Llama
+# yields project slugs each adapter reads pools for.
+PROVIDER_SETTINGS = {
+    "moonwell": {
+        "deadline": 8.0,
+        "yield_projects": ["moonwell"],
+    },
+    "morpho": {
+        "deadline": 8.0,
+        "yield_projects": ["morpho", "morpho-blue"],
+        # Window used to derive vault APY from the on-chain share price.
+        "apy_window_seconds": 7 * 24 * 60 * 60,
+        "block_time_seconds": 2,
+    },
+}
+
+# Deadline (seconds) for the data every adapter shares: the /pools stream,
+# token prices, the chain head and token metadata. Each part that misses it
+# is left out of the snapshot (the previous pool universe is kept), so it
+# stays below the per-provider deadlines.
+SNAPSHOT_SETTINGS = {
+    "context_deadline": 6.0,
+}
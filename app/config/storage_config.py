@@ -0,0 +1,20 @@
+import os
+
+STORAGE_CONFIG = {
+    "cache_dir": os.getenv("AQUA_CACHE_DIR", ".cache/aqua"),
+    "data_dir": os.getenv("AQUA_DATA_DIR", ".data/aqua"),
+    "http_cache_max_bytes": 256 * 1024 * 1024,
+    # A stored price counts as "the price N ago" if it is at most this
+    # fraction of N away from the exact lookback time.
+    "price_history_tolerance": 0.05,
+    # Market snapshots store a full keyframe, then at most this many deltas.
+    "snapshot_keyframe_interval": 48,
+}
+
+BACKFILL_CONFIG = {
+    "checkpoint_path": os.path.join(STORAGE_CONFIG["data_dir"], "backfill_checkpoint.json"),
+    "max_concurrency": 8,
+    # Historical prices are requested in windows of this many days.
+    "price_chunk_days": 7,
+    "price_period": "1h",
+}
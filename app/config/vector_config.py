@@ -0,0 +1,33 @@
+import os
+
+from app.config.storage_config import STORAGE_CONFIG
+
+# Bulk writes to the vector store: texts are embedded in batches of
+# "embed_batch_size" and upserted "upsert_batch_size" vectors at a time, with at
+# most "max_concurrent_batches" batches in flight. The optional write-behind
+# buffer flushes once it holds "buffer_max_records" records or every
+# "buffer_flush_interval" seconds.
+VECTOR_WRITE_CONFIG = {
+    "embed_batch_size": 256,
+    "upsert_batch_size": 100,
+    "max_concurrent_batches": 4,
+    "buffer_max_records": 500,
+    "buffer_flush_interval": 5.0,
+}
+
+# Vector store backend: "pinecone" or "local" (in-process index under
+# "directory"). The local index answers queries by brute force up to
+# "brute_force_max" vectors and with an approximate neighbour graph above it.
+# "embeddings" set to "fake" swaps OpenAI for deterministic offline vectors.
+# Point lookups by id are sent "fetch_batch_size" ids at a time.
+VECTOR_INDEX_CONFIG = {
+    "backend": os.getenv("VECTOR_BACKEND", "pinecone"),
+    "embeddings": os.getenv("VECTOR_EMBEDDINGS", "openai"),
+    "directory": os.path.join(STORAGE_CONFIG["data_dir"], "vector_index"),
+    "dimension": 1536,
+    "brute_force_max": 20000,
+    "graph_degree": 16,
+    "ef_construction": 64,
+    "ef_search": 64,
+    "fetch_batch_size": 1000,
+}
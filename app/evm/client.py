@@ -1,26 +1,104 @@
 from web3 import Web3
+import asyncio
 import os
 import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+from app.config.chains_config import CHAINS, DEFAULT_CHAIN
+from app.config.http_config import RESILIENCE_CONFIG
+from app.utils.resilience import call_with_resilience
 
 logger = logging.getLogger("web3_client")
 
-def create_web3_client():
-    base_rpc_url = os.getenv('BASE_RPC_URL')
-    if not base_rpc_url:
-        raise ValueError("BASE_RPC_URL environment variable is required")
+_web3_clients: Dict[str, Web3] = {}
+_connect_failures: Dict[str, Tuple[float, Exception]] = {}
+_chain_locks: Dict[str, threading.Lock] = {}
+_chain_locks_lock = threading.Lock()
 
-    provider = Web3.HTTPProvider(base_rpc_url)
+
+def _chain_lock(chain: str) -> threading.Lock:
+    with _chain_locks_lock:
+        return _chain_locks.setdefault(chain, threading.Lock())
+
+def create_web3_client(chain: str = DEFAULT_CHAIN):
+    rpc_env = CHAINS[chain]["rpc_env"]
+    rpc_url = os.getenv(rpc_env)
+    if not rpc_url:
+        raise ValueError(f"{rpc_env} environment variable is required")
+
+    provider = Web3.HTTPProvider(rpc_url)
     w3 = Web3(provider)
     
     if not w3.is_connected():
-        raise ConnectionError("Failed to connect to Ethereum node")
+        raise ConnectionError(f"Failed to connect to {chain} node")
         
     return w3
 
-try:
-    web3_client = create_web3_client()
-    public_client = web3_client
-    wallet_client = web3_client  
-except Exception as e:
-    logger.error(f"Failed to initialize Web3 client: {e}", exc_info=True)
-    raise
\ No newline at end of file
+def get_web3_client(chain: str = DEFAULT_CHAIN) -> Web3:
+    """
+    Return the shared Web3 client of a chain, connecting on first use.
+
+    Each chain has its own client, and so its own HTTP connection pool.
+    Connects are serialized per chain, so a chain whose node is down never
+    blocks lookups for another, and a failed connect is remembered for
+    ``rpc_connect_cooldown`` seconds so later lookups fail fast.
+
+    Args:
+        chain (str): Key of ``CHAINS``. Defaults to "base".
+
+    Returns:
+        Web3: Client for the chain's ``rpc_env`` endpoint.
+
+    Raises:
+        ValueError: If the chain's RPC URL is not set.
+        ConnectionError: If the node cannot be reached.
+    """
+    client = _web3_clients.get(chain)
+    if client is not None:
+        return client
+    with _chain_lock(chain):
+        if chain in _web3_clients:
+            return _web3_clients[chain]
+        failure = _connect_failures.get(chain)
+        if failure is not None and time.monotonic() - failure[0] < RESILIENCE_CONFIG["rpc_connect_cooldown"]:
+            raise ConnectionError(f"{chain} node unavailable, retrying after cooldown: {failure[1]}")
+        try:
+            _web3_clients[chain] = create_web3_client(chain)
+        except Exception as e:
+            _connect_failures[chain] = (time.monotonic(), e)
+            logger.error(f"Failed to initialize Web3 client for {chain}: {e}", exc_info=True)
+            raise
+        _connect_failures.pop(chain, None)
+        return _web3_clients[chain]
+
+def rpc_available(chain: str = DEFAULT_CHAIN) -> bool:
+    return bool(os.getenv(CHAINS[chain]["rpc_env"]))
+
+def rpc_breaker(w3: Web3) -> str:
+    """
+    Return the circuit breaker name for a client, so each chain's RPC fails independently.
+    """
+    for chain, client in list(_web3_clients.items()):
+        if client is w3:
+            return f"rpc:{chain}"
+    return "rpc"
+
+async def rpc_call(fn: Callable[..., Any], *args: Any, retries: int = 3, chain: str = DEFAULT_CHAIN) -> Any:
+    """
+    Run a read-only, blocking web3 call off the event loop with resilience.
+
+    Calls go through the chain's "rpc:<chain>" circuit breaker and are retried
+    with jittered backoff. Never use this for state-changing calls such as
+    sending transactions.
+
+    Args:
+        fn (Callable[..., Any]): Blocking web3 callable.
+        *args (Any): Arguments for ``fn``.
+        retries (int): Maximum number of attempts. Defaults to 3.
+        chain (str): Chain the call targets. Defaults to "base".
+
+    Returns:
+        Any: Result of ``fn``.
+    """
+    return await call_with_resilience(f"rpc:{chain}", lambda: asyncio.to_thread(fn, *args), retries=retries)
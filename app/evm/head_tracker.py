@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.config.chains_config import CHAINS, DEFAULT_CHAIN
+from app.evm.client import get_web3_client, rpc_call
+
+logger = logging.getLogger("HEAD_TRACKER")
+
+
+@dataclass
+class BlockHead:
+    number: int
+    timestamp: int
+    hash: str
+    seenAt: float
+
+
+@dataclass
+class _BlockSubscriber:
+    every: int
+    callback: Callable[[BlockHead], Awaitable[None]]
+    lastBlock: Optional[int] = None
+
+
+class HeadTracker:
+    """
+    Tracks the chain head for all readers in the process.
+
+    There is one tracker per chain (see ``get_head_tracker``). When the
+    chain's ``ws_env`` URL is set the tracker subscribes to ``newHeads``; if the
+    subscription cannot be established or drops, it falls back to polling
+    ``eth_getBlockByNumber("latest")`` every ``poll_interval`` seconds.
+    Without a running tracker, ``latest`` performs a one-off read that is
+    reused for ``poll_interval`` seconds.
+    """
+
+    def __init__(self, chain: str = DEFAULT_CHAIN, ws_url: Optional[str] = None, poll_interval: float = 2.0):
+        self.chain = chain
+        self.ws_url = ws_url if ws_url is not None else os.getenv(CHAINS[chain]["ws_env"], "")
+        self.poll_interval = poll_interval
+        self.head: Optional[BlockHead] = None
+        self._subscribers: List[_BlockSubscriber] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def latest(self) -> BlockHead:
+        """
+        Return the most recent known head, reading it from the node if stale.
+
+        Returns:
+            BlockHead: Block number, block timestamp and hash.
+        """
+        if self.head is not None and (self.running or time.monotonic() - self.head.seenAt < self.poll_interval):
+            return self.head
+        await self._poll_once()
+        return self.head
+
+    def on_blocks(self, every: int, callback: Callable[[BlockHead], Awaitable[None]]) -> None:
+        """
+        Run ``callback`` whenever the head has advanced by at least ``every`` blocks.
+
+        Args:
+            every (int): Block interval.
+            callback (Callable[[BlockHead], Awaitable[None]]): Coroutine function receiving the new head.
+        """
+        self._subscribers.append(_BlockSubscriber(every=every, callback=callback))
+
+    def start(self) -> None:
+        """
+        Start following the head in the background on the running loop.
+        """
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        if self.ws_url:
+            try:
+                await self._subscribe()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"newHeads subscription on {self.chain} failed, falling back to polling: {e}")
+        while True:
+            try:
+                await self._poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error polling {self.chain} chain head: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _subscribe(self) -> None:
+        from web3 import AsyncWeb3, WebSocketProvider
+
+        async with AsyncWeb3(WebSocketProvider(self.ws_url)) as w3:
+            await w3.eth.subscribe("newHeads")
+            logger.info(f"Subscribed to newHeads on {self.chain}")
+            async for message in w3.socket.process_subscriptions():
+                header = message.get("result", message)
+                await self._update(header)
+
+    async def _poll_once(self) -> None:
+        w3 = await asyncio.to_thread(get_web3_client, self.chain)
+        block = await rpc_call(w3.eth.get_block, "latest", chain=self.chain)
+        await self._update(block)
+
+    async def _update(self, header) -> None:
+        number = int(header["number"], 16) if isinstance(header["number"], str) else int(header["number"])
+        if self.head is not None and number <= self.head.number:
+            self.head.seenAt = time.monotonic()
+            return
+        timestamp = header["timestamp"]
+        block_hash = header.get("hash")
+        self.head = BlockHead(
+            number=number,
+            timestamp=int(timestamp, 16) if isinstance(timestamp, str) else int(timestamp),
+            hash=block_hash.hex() if hasattr(block_hash, "hex") else str(block_hash),
+            seenAt=time.monotonic(),
+        )
+        for subscriber in self._subscribers:
+            if subscriber.lastBlock is None or number - subscriber.lastBlock >= subscriber.every:
+                subscriber.lastBlock = number
+                asyncio.get_running_loop().create_task(self._notify(subscriber, self.head))
+
+    async def _notify(self, subscriber: _BlockSubscriber, head: BlockHead) -> None:
+        try:
+            await subscriber.callback(head)
+        except Exception as e:
+            logger.error(f"Block callback failed at block {head.number}: {e}")
+
+
+_trackers: Dict[str, HeadTracker] = {}
+
+
+def get_head_tracker(chain: str = DEFAULT_CHAIN) -> HeadTracker:
+    """
+    Return the shared head tracker of a chain.
+    """
+    if chain not in _trackers:
+        _trackers[chain] = HeadTracker(chain)
+    return _trackers[chain]
+
+
+head_tracker = get_head_tracker(DEFAULT_CHAIN)
@@ -0,0 +1,184 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+from web3 import Web3
+
+from app.config.chains_config import DEFAULT_CHAIN
+from app.config.protocols_config import PROTOCOLS_CONFIG
+from app.evm.head_tracker import get_head_tracker
+from app.evm.multicall import BlockIdentifier, Call, multicall
+from app.evm.token_registry import token_registry
+
+logger = logging.getLogger("MOONWELL_READER")
+
+MANTISSA = 10 ** 18
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60
+
+MARKET_CALLS = {
+    "supplyRate": ("supplyRatePerTimestamp()", ("uint256",)),
+    "borrowRate": ("borrowRatePerTimestamp()", ("uint256",)),
+    "cash": ("getCash()", ("uint256",)),
+    "totalBorrows": ("totalBorrows()", ("uint256",)),
+    "totalReserves": ("totalReserves()", ("uint256",)),
+    "reserveFactor": ("reserveFactorMantissa()", ("uint256",)),
+    "underlying": ("underlying()", ("address",)),
+    "interestRateModel": ("interestRateModel()", ("address",)),
+}
+
+RATE_MODEL_CALLS = {
+    "baseRate": ("baseRatePerTimestamp()", ("uint256",)),
+    "multiplier": ("multiplierPerTimestamp()", ("uint256",)),
+    "jumpMultiplier": ("jumpMultiplierPerTimestamp()", ("uint256",)),
+    "kink": ("kink()", ("uint256",)),
+}
+
+
+@dataclass
+class MoonwellMarketState:
+    mToken: str
+    symbol: str
+    underlying: str
+    underlyingDecimals: int
+    supplyApy: float
+    borrowApy: float
+    cash: float
+    totalBorrows: float
+    totalReserves: float
+    reserveFactor: float
+    collateralFactor: float
+    interestRateModel: str
+    blockNumber: int
+
+    @property
+    def totalSupply(self) -> float:
+        return self.cash + self.totalBorrows - self.totalReserves
+
+
+@dataclass
+class JumpRateModel:
+    """
+    Parameters of a jump-rate interest rate model, as per-second rate fractions.
+    """
+    address: str
+    baseRate: float
+    multiplier: float
+    jumpMultiplier: float
+    kink: float
+
+
+def rate_to_apy(rate_per_second: int) -> float:
+    """
+    Convert a per-second rate mantissa into a compounded APY percentage.
+    """
+    return ((1 + rate_per_second / MANTISSA) ** SECONDS_PER_YEAR - 1) * 100
+
+
+async def read_moonwell_markets(
+    w3: Web3,
+    block_identifier: Optional[BlockIdentifier] = None,
+    markets: Optional[Dict[str, str]] = None,
+    chain: str = DEFAULT_CHAIN,
+) -> Dict[str, MoonwellMarketState]:
+    """
+    Read rates, balances and collateral factors of Moonwell markets at one block.
+
+    All markets are read in one Multicall3 batch pinned to one block;
+    underlying decimals come from the token registry.
+
+    Args:
+        w3 (Web3): Web3 client.
+        block_identifier (Optional[BlockIdentifier]): Block to read at. Defaults to the chain's tracked head.
+        markets (Optional[Dict[str, str]]): mToken symbol to address. Defaults to the configured markets.
+        chain (str): Chain whose head tracker pins the read. Defaults to DEFAULT_CHAIN.
+
+    Returns:
+        Dict[str, MoonwellMarketState]: Market state keyed by checksummed underlying address.
+    """
+    config = PROTOCOLS_CONFIG["moonwell"]["addresses"]
+    markets = markets or config["markets"]
+    comptroller = config["comptroller"]
+    if block_identifier is None:
+        block_identifier = (await get_head_tracker(chain).latest()).number
+
+    symbols = list(markets)
+    calls = []
+    for symbol in symbols:
+        address = markets[symbol]
+        calls.extend(Call(address, signature, output) for signature, output in MARKET_CALLS.values())
+        calls.append(Call(comptroller, "markets(address)", ("bool", "uint256"), (address,)))
+    results = await multicall(w3, calls, block_identifier)
+
+    per_market = len(MARKET_CALLS) + 1
+    raw: Dict[str, Dict[str, object]] = {}
+    for i, symbol in enumerate(symbols):
+        chunk = results[i * per_market:(i + 1) * per_market]
+        if any(result is None for result in chunk):
+            logger.warning(f"Skipping {symbol}: one or more calls reverted")
+            continue
+        values = {name: result[0] for name, result in zip(MARKET_CALLS, chunk)}
+        values["collateralFactor"] = chunk[-1][1]
+        raw[symbol] = values
+
+    metadata = await token_registry.resolve([values["underlying"] for values in raw.values()], w3)
+
+    states: Dict[str, MoonwellMarketState] = {}
+    for symbol, values in raw.items():
+        token = metadata.get(values["underlying"])
+        if token is None:
+            logger.warning(f"Skipping {symbol}: could not read underlying decimals")
+            continue
+        scale = 10 ** token.decimals
+        underlying = Web3.to_checksum_address(values["underlying"])
+        states[underlying] = MoonwellMarketState(
+            mToken=markets[symbol],
+            symbol=symbol,
+            underlying=underlying,
+            underlyingDecimals=token.decimals,
+            supplyApy=rate_to_apy(values["supplyRate"]),
+            borrowApy=rate_to_apy(values["borrowRate"]),
+            cash=values["cash"] / scale,
+            totalBorrows=values["totalBorrows"] / scale,
+            totalReserves=values["totalReserves"] / scale,
+            reserveFactor=values["reserveFactor"] / MANTISSA,
+            collateralFactor=values["collateralFactor"] / MANTISSA,
+            interestRateModel=Web3.to_checksum_address(values["interestRateModel"]),
+            blockNumber=int(block_identifier) if isinstance(block_identifier, int) else 0,
+        )
+    return states
+
+
+async def read_rate_models(
+    w3: Web3,
+    addresses: Iterable[str],
+    block_identifier: Optional[BlockIdentifier] = None,
+) -> Dict[str, JumpRateModel]:
+    """
+    Read the parameters of jump-rate interest rate models in one Multicall3 batch.
+
+    Args:
+        w3 (Web3): Web3 client.
+        addresses (Iterable[str]): Rate model addresses, e.g. ``MoonwellMarketState.interestRateModel``.
+        block_identifier (Optional[BlockIdentifier]): Block to read at. Defaults to latest.
+
+    Returns:
+        Dict[str, JumpRateModel]: Models keyed by address; models whose calls revert are skipped.
+    """
+    addresses = sorted(set(addresses))
+    calls = [
+        Call(address, signature, output)
+        for address in addresses
+        for signature, output in RATE_MODEL_CALLS.values()
+    ]
+    results = await multicall(w3, calls, block_identifier or "latest")
+
+    per_model = len(RATE_MODEL_CALLS)
+    models: Dict[str, JumpRateModel] = {}
+    for i, address in enumerate(addresses):
+        chunk = results[i * per_model:(i + 1) * per_model]
+        if any(result is None for result in chunk):
+            logger.warning(f"Skipping rate model {address}: not a jump-rate model")
+            continue
+        values = {name: result[0] / MANTISSA for name, result in zip(RATE_MODEL_CALLS, chunk)}
+        models[address] = JumpRateModel(address=address, **values)
+    return models
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from web3 import Web3
+
+from app.config.chains_config import DEFAULT_CHAIN
+from app.config.protocols_config import PROTOCOLS_CONFIG, PROVIDER_SETTINGS
+from app.evm.head_tracker import get_head_tracker
+from app.evm.multicall import Call, multicall
+from app.evm.token_registry import token_registry
+
+logger = logging.getLogger("MORPHO_READER")
+
+WAD = 10 ** 18
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60
+SHARE_UNIT = 10 ** 18
+
+VAULT_CALLS = {
+    "asset": ("asset()", ("address",)),
+    "totalAssets": ("totalAssets()", ("uint256",)),
+    "fee": ("fee()", ("uint96",)),
+    "timelock": ("timelock()", ("uint256",)),
+    "sharePrice": ("convertToAssets(uint256)", ("uint256",), (SHARE_UNIT,)),
+}
+
+
+@dataclass
+class MorphoVaultState:
+    vault: str
+    symbol: str
+    asset: str
+    assetDecimals: int
+    totalAssets: float
+    performanceFee: float
+    timelock: int
+    apy: Optional[float]
+    blockNumber: int
+
+
+_cache: "OrderedDict[Tuple[int, Tuple[str, ...]], Dict[str, MorphoVaultState]]" = OrderedDict()
+_CACHE_SIZE = 8
+
+
+def _vault_call(address: str, spec: tuple) -> Call:
+    signature, output, *args = spec
+    return Call(address, signature, output, args[0] if args else ())
+
+
+async def read_morpho_vaults(
+    w3: Web3,
+    block_number: Optional[int] = None,
+    vaults: Optional[Dict[str, str]] = None,
+    chain: str = DEFAULT_CHAIN,
+) -> Dict[str, MorphoVaultState]:
+    """
+    Read TVL, performance fee, timelock and share-price APY of MetaMorpho vaults.
+
+    Vault fields are batched into one Multicall3 call at ``block_number`` and
+    the share price ``apy_window_seconds`` earlier into one more; asset
+    decimals come from the token registry. Results are cached per block.
+
+    Args:
+        w3 (Web3): Web3 client.
+        block_number (Optional[int]): Block to read at. Defaults to the chain's tracked head.
+        vaults (Optional[Dict[str, str]]): Vault symbol to address. Defaults to the configured vaults.
+        chain (str): Chain whose head tracker pins the read. Defaults to DEFAULT_CHAIN.
+
+    Returns:
+        Dict[str, MorphoVaultState]: Vault state keyed by checksummed vault address.
+    """
+    vaults = vaults or PROTOCOLS_CONFIG["morpho"]["addresses"]["vaults"]
+    settings = PROVIDER_SETTINGS["morpho"]
+    if block_number is None:
+        block_number = (await get_head_tracker(chain).latest()).number
+    cache_key = (int(block_number), tuple(sorted(vaults.values())))
+    if cache_key in _cache:
+        _cache.move_to_end(cache_key)
+        return _cache[cache_key]
+
+    symbols = list(vaults)
+    calls = [
+        _vault_call(vaults[symbol], spec) for symbol in symbols for spec in VAULT_CALLS.values()
+    ]
+    results = await multicall(w3, calls, block_number)
+
+    raw: Dict[str, Dict[str, object]] = {}
+    for i, symbol in enumerate(symbols):
+        chunk = results[i * len(VAULT_CALLS):(i + 1) * len(VAULT_CALLS)]
+        if any(result is None for result in chunk):
+            logger.warning(f"Skipping {symbol}: one or more calls reverted")
+            continue
+        raw[symbol] = {name: result[0] for name, result in zip(VAULT_CALLS, chunk)}
+
+    window_blocks = settings["apy_window_seconds"] // settings["block_time_seconds"]
+    past_block = max(0, int(block_number) - window_blocks)
+    metadata_task = token_registry.resolve([values["asset"] for values in raw.values()], w3)
+    past_task = multicall(
+        w3, [_vault_call(vaults[symbol], VAULT_CALLS["sharePrice"]) for symbol in raw], past_block
+    )
+    metadata, past_results = await asyncio.gather(metadata_task, past_task, return_exceptions=True)
+    if isinstance(metadata, BaseException):
+        raise metadata
+    if isinstance(past_results, BaseException):
+        logger.warning(f"Could not read historical share prices (archive access needed?): {past_results}")
+        past_results = [None] * len(raw)
+
+    states: Dict[str, MorphoVaultState] = {}
+    for (symbol, values), past in zip(raw.items(), past_results):
+        asset = metadata.get(values["asset"])
+        if asset is None:
+            logger.warning(f"Skipping {symbol}: could not read asset decimals")
+            continue
+        apy = None
+        if past and past[0] > 0:
+            growth = values["sharePrice"] / past[0]
+            apy = (growth ** (SECONDS_PER_YEAR / settings["apy_window_seconds"]) - 1) * 100
+        address = Web3.to_checksum_address(vaults[symbol])
+        states[address] = MorphoVaultState(
+            vault=address,
+            symbol=symbol,
+            asset=Web3.to_checksum_address(values["asset"]),
+            assetDecimals=asset.decimals,
+            totalAssets=values["totalAssets"] / 10 ** asset.decimals,
+            performanceFee=values["fee"] / WAD,
+            timelock=values["timelock"],
+            apy=apy,
+            blockNumber=int(block_number),
+        )
+
+    _cache[cache_key] = states
+    while len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return states
@@ -0,0 +1,86 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from eth_abi import decode, encode
+from web3 import Web3
+
+from app.config.addresses_config import MULTICALL3_ADDRESS
+from app.evm.client import rpc_breaker
+from app.utils.resilience import call_with_resilience
+
+BlockIdentifier = Union[int, str]
+
+AGGREGATE3_SELECTOR = Web3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+
+
+@dataclass(frozen=True)
+class Call:
+    """
+    A single read-only contract call to batch through Multicall3.
+
+    ``signature`` is the canonical function signature, e.g. ``"markets(address)"``;
+    its argument types are taken from the signature.
+    """
+    target: str
+    signature: str
+    output_types: Tuple[str, ...]
+    args: Tuple[Any, ...] = ()
+
+    @property
+    def input_types(self) -> List[str]:
+        inner = self.signature[self.signature.index("(") + 1:-1]
+        return [t for t in inner.split(",") if t]
+
+    def encode(self) -> bytes:
+        selector = Web3.keccak(text=self.signature)[:4]
+        return selector + encode(self.input_types, list(self.args))
+
+    def decode(self, data: bytes) -> Tuple[Any, ...]:
+        return decode(list(self.output_types), data)
+
+
+async def multicall(
+    w3: Web3,
+    calls: Sequence[Call],
+    block_identifier: BlockIdentifier = "latest",
+    batch_size: int = 300,
+) -> List[Optional[Tuple[Any, ...]]]:
+    """
+    Execute read-only calls through Multicall3 ``aggregate3`` at one block.
+
+    Calls are sent with ``allowFailure`` so one reverting call does not sink
+    the batch; its result is None. Each batch of ``batch_size`` calls is a
+    single ``eth_call`` pinned to ``block_identifier``.
+
+    Args:
+        w3 (Web3): Web3 client.
+        calls (Sequence[Call]): Calls to execute.
+        block_identifier (BlockIdentifier): Block number or tag. Defaults to "latest".
+        batch_size (int): Maximum calls per ``eth_call``. Defaults to 300.
+
+    Returns:
+        List[Optional[Tuple[Any, ...]]]: Decoded outputs in call order, None for failed calls.
+    """
+    batches = [calls[i:i + batch_size] for i in range(0, len(calls), batch_size)]
+
+    async def run(batch: Sequence[Call]) -> List[Optional[Tuple[Any, ...]]]:
+        data = AGGREGATE3_SELECTOR + encode(
+            ["(address,bool,bytes)[]"],
+            [[(Web3.to_checksum_address(call.target), True, call.encode()) for call in batch]],
+        )
+        tx = {"to": Web3.to_checksum_address(MULTICALL3_ADDRESS), "data": Web3.to_hex(data)}
+        raw = await call_with_resilience(
+            rpc_breaker(w3), lambda: asyncio.to_thread(w3.eth.call, tx, block_identifier)
+        )
+        (results,) = decode(["(bool,bytes)[]"], bytes(raw))
+        decoded: List[Optional[Tuple[Any, ...]]] = []
+        for call, (success, return_data) in zip(batch, results):
+            try:
+                decoded.append(call.decode(return_data) if success else None)
+            except Exception:
+                decoded.append(None)
+        return decoded
+
+    outputs = await asyncio.gather(*(run(batch) for batch in batches))
+    return [result for batch in outputs for result in batch]
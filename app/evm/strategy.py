@@ -3,7 +3,7 @@ from typing import Dict, Any
 from web3 import Web3
 from eth_account import Account
 from eth_typing import Address
-from app.evm.client import public_client, wallet_client
+from app.evm.client import get_web3_client, rpc_call
 from app.evm.contracts.abis.strategy_abi import STRATEGY_ABI
 from app.types.strategy import ACTION_TYPES
 
@@ -17,6 +17,7 @@ async def deploy_strategy_onchain(
        raise ValueError("PRIVATE_KEY environment variable is required")
 
    account = Account.from_key(private_key)
+   public_client = wallet_client = get_web3_client()
    
    strategy_contract = public_client.eth.contract(
        address=contract_address,
@@ -35,6 +36,10 @@ async def deploy_strategy_onchain(
        for step in strategy["steps"]
    ]
 
+   nonce = await rpc_call(public_client.eth.get_transaction_count, account.address)
+   max_priority_fee = await rpc_call(lambda: public_client.eth.max_priority_fee)
+   gas_price = await rpc_call(lambda: public_client.eth.gas_price)
+
    transaction = strategy_contract.functions.createStrategy(
        strategy["name"],
        strategy["description"],
@@ -42,10 +47,10 @@ async def deploy_strategy_onchain(
        int(strategy["minDeposit"])
    ).build_transaction({
        'from': account.address,
-       'nonce': public_client.eth.get_transaction_count(account.address),
+       'nonce': nonce,
        'gas': 2000000,
-       'maxFeePerGas': public_client.eth.max_priority_fee * 2 + public_client.eth.gas_price,
-       'maxPriorityFeePerGas': public_client.eth.max_priority_fee
+       'maxFeePerGas': max_priority_fee * 2 + gas_price,
+       'maxPriorityFeePerGas': max_priority_fee
    })
 
    signed_txn = wallet_client.eth.account.sign_transaction(
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional
+
+from web3 import Web3
+
+from app.config.chains_config import DEFAULT_CHAIN
+from app.config.storage_config import STORAGE_CONFIG
+from app.evm.multicall import Call, multicall
+
+logger = logging.getLogger("TOKEN_REGISTRY")
+
+METADATA_CALLS = {
+    "decimals": ("decimals()", ("uint8",)),
+    "symbol": ("symbol()", ("string",)),
+    "name": ("name()", ("string",)),
+}
+
+
+@dataclass
+class TokenMetadata:
+    address: str
+    decimals: int
+    symbol: str
+    name: str
+
+
+def _bytes32_to_str(value: bytes) -> str:
+    return value.rstrip(b"\x00").decode("utf-8", errors="ignore")
+
+
+class TokenRegistry:
+    """
+    ERC-20 metadata registry with an in-memory map persisted to a JSON file.
+
+    Unknown addresses are resolved together in one Multicall3 batch (plus one
+    for tokens exposing ``bytes32`` symbols/names); known ones never hit the chain.
+    Resolution and saving are serialised, so concurrent callers don't read the
+    same tokens twice or write the file over each other.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._tokens: Optional[Dict[str, TokenMetadata]] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    @property
+    def tokens(self) -> Dict[str, TokenMetadata]:
+        if self._tokens is None:
+            try:
+                with open(self.path) as f:
+                    self._tokens = {
+                        address.lower(): TokenMetadata(**data) for address, data in json.load(f).items()
+                    }
+            except (OSError, ValueError, TypeError):
+                self._tokens = {}
+        return self._tokens
+
+    def get(self, address: str) -> Optional[TokenMetadata]:
+        """
+        Return cached metadata for an address, or None if it was never resolved.
+        """
+        return self.tokens.get(address.lower())
+
+    def _save(self, snapshot: Dict[str, Dict[str, object]]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    async def resolve(self, addresses: Iterable[str], w3: Web3) -> Dict[str, TokenMetadata]:
+        """
+        Return metadata for the given tokens, reading unknown ones on-chain in one batch.
+
+        Args:
+            addresses (Iterable[str]): Token addresses.
+            w3 (Web3): Web3 client used for tokens not in the registry.
+
+        Returns:
+            Dict[str, TokenMetadata]: Metadata keyed by the addresses as given.
+        """
+        addresses = list(addresses)
+        if any(self.get(a) is None for a in addresses):
+            async with self._get_lock():
+                # Re-check under the lock: another caller may have resolved them meanwhile.
+                missing = sorted({a.lower() for a in addresses if self.get(a) is None})
+                if missing:
+                    await self._resolve_missing(missing, w3)
+        return {address: self.get(address) for address in addresses if self.get(address)}
+
+    async def _resolve_missing(self, missing: List[str], w3: Web3) -> None:
+        calls = [
+            Call(address, signature, output)
+            for address in missing
+            for signature, output in METADATA_CALLS.values()
+        ]
+        results = await multicall(w3, calls, "latest")
+        per_token = len(METADATA_CALLS)
+
+        retry = []
+        values: Dict[str, Dict[str, object]] = {}
+        for i, address in enumerate(missing):
+            chunk = dict(zip(METADATA_CALLS, results[i * per_token:(i + 1) * per_token]))
+            if chunk["decimals"] is None:
+                logger.warning(f"Could not read decimals for {address}")
+                continue
+            values[address] = {name: result[0] if result else None for name, result in chunk.items()}
+            retry.extend((address, name) for name in ("symbol", "name") if chunk[name] is None)
+
+        if retry:
+            fallback = await multicall(
+                w3,
+                [Call(address, METADATA_CALLS[name][0], ("bytes32",)) for address, name in retry],
+                "latest",
+            )
+            for (address, name), result in zip(retry, fallback):
+                values[address][name] = _bytes32_to_str(result[0]) if result else ""
+
+        for address, data in values.items():
+            self.tokens[address] = TokenMetadata(
+                address=Web3.to_checksum_address(address),
+                decimals=int(data["decimals"]),
+                symbol=data["symbol"] or "",
+                name=data["name"] or "",
+            )
+        # Serialise on the loop; the thread only writes the snapshot.
+        snapshot = {address: asdict(meta) for address, meta in self.tokens.items()}
+        await asyncio.to_thread(self._save, snapshot)
+        logger.info(f"Resolved metadata for {len(values)} tokens")
+
+
+_registries: Dict[str, TokenRegistry] = {}
+
+
+def get_token_registry(chain: str = DEFAULT_CHAIN) -> TokenRegistry:
+    """
+    Return the registry of a chain, persisted to ``<data_dir>/tokens/<chain>.json``.
+    """
+    if chain not in _registries:
+        _registries[chain] = TokenRegistry(os.path.join(STORAGE_CONFIG["data_dir"], "tokens", f"{chain}.json"))
+    return _registries[chain]
+
+
+token_registry = get_token_registry(DEFAULT_CHAIN)
@@ -0,0 +1,221 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from app.config.chains_config import CHAINS, DEFAULT_CHAIN
+from app.config.protocols_config import PROVIDER_SETTINGS
+from app.config.storage_config import BACKFILL_CONFIG
+from app.providers.defi_llama_provider import (
+    fetch_pool_chart,
+    fetch_price_chart,
+    fetch_protocol_tvl,
+    fetch_yield_pools,
+)
+from app.services.pool_history_service import POOL_HISTORY_FIELDS, pool_history_store
+from app.services.price_history_service import price_history_store
+from app.services.protocol_history_service import ProtocolHistoryService, protocol_tvl_store
+from app.utils.api_client import close_http_client
+
+logger = logging.getLogger("backfill_job")
+logging.basicConfig(level=logging.INFO)
+
+PERIOD_UNITS = {"m": 60, "h": 60 * 60, "d": 24 * 60 * 60, "w": 7 * 24 * 60 * 60}
+
+
+def _period_seconds(period: str) -> int:
+    return int(period[:-1] or 1) * PERIOD_UNITS[period[-1]]
+
+
+class BackfillCheckpoint:
+    """
+    Set of completed backfill tasks persisted to a JSON file after every task.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.done: Set[str] = set(json.load(f).get("done", []))
+        except (OSError, ValueError):
+            self.done = set()
+        self._lock = asyncio.Lock()
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(f"{self.path}.tmp", "w") as f:
+            json.dump({"done": sorted(self.done)}, f)
+        os.replace(f"{self.path}.tmp", self.path)
+
+    async def mark(self, key: str) -> None:
+        async with self._lock:
+            self.done.add(key)
+            await asyncio.to_thread(self._save)
+
+    def reset(self) -> None:
+        self.done.clear()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class BackfillJob:
+    """
+    Seeds the local pool, price and protocol TVL stores for a date range.
+
+    The work is split into independent tasks (one per pool chart, protocol
+    and price window) that run with bounded concurrency. Each finished task is
+    recorded in a checkpoint file under the job's ``window`` label, so an
+    interrupted run resumes with only the unfinished tasks. Points are merged
+    into the stores, so history older than what live ingestion already wrote
+    is inserted in place.
+    """
+
+    def __init__(
+        self,
+        start: int,
+        end: int,
+        chain: str = DEFAULT_CHAIN,
+        projects: Optional[Iterable[str]] = None,
+        max_concurrency: int = BACKFILL_CONFIG["max_concurrency"],
+        checkpoint: Optional[BackfillCheckpoint] = None,
+        window: Optional[str] = None,
+    ):
+        self.start = start
+        self.end = end
+        # Checkpoint keys use the range as requested, so an open-ended run
+        # ("until now") resumes the same tasks even though ``end`` moves.
+        self.window = window or f"{start}:{end}"
+        self.chain = chain
+        self.llama_chain = CHAINS[chain]["llama_name"]
+        self.projects = sorted(
+            projects or {p for settings in PROVIDER_SETTINGS.values() for p in settings["yield_projects"]}
+        )
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.checkpoint = checkpoint or BackfillCheckpoint(BACKFILL_CONFIG["checkpoint_path"])
+        self.stats = {"tasks": 0, "skipped": 0, "failed": 0, "points": 0}
+
+    async def _run_task(self, key: str, task: Callable[[], Awaitable[int]]) -> None:
+        if key in self.checkpoint.done:
+            self.stats["skipped"] += 1
+            return
+        async with self.semaphore:
+            try:
+                points = await task()
+                self.stats["points"] += points
+                self.stats["tasks"] += 1
+                await self.checkpoint.mark(key)
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"Backfill task {key} failed: {e}")
+
+    def _in_range(self, points: List[Dict]) -> List[Dict]:
+        return [point for point in points if self.start <= point["timestamp"] <= self.end]
+
+    async def backfill_pool(self, pool_id: str) -> int:
+        points = self._in_range(await fetch_pool_chart(pool_id))
+        rows = [{"timestamp": p["timestamp"], **{name: p.get(name) for name in POOL_HISTORY_FIELDS}} for p in points]
+        return await asyncio.to_thread(pool_history_store.merge_rows, pool_id, rows)
+
+    async def backfill_protocol_tvl(self, slug: str) -> int:
+        rows = self._in_range(await fetch_protocol_tvl(slug, self.llama_chain))
+        series_id = ProtocolHistoryService.series_id(slug, self.llama_chain)
+        return await asyncio.to_thread(protocol_tvl_store.merge_rows, series_id, rows)
+
+    async def backfill_prices(self, coin_ids: List[str], start: int, end: int, period: str) -> int:
+        span = max(1, -(-(end - start) // _period_seconds(period)))
+        charts = await fetch_price_chart(coin_ids, start, span, period)
+
+        def write() -> int:
+            return sum(
+                price_history_store.merge_rows(
+                    coin_id, [p for p in points if start <= p["timestamp"] <= end and p.get("price") is not None]
+                )
+                for coin_id, points in charts.items()
+            )
+
+        return await asyncio.to_thread(write)
+
+    async def run(self, kinds: Iterable[str] = ("pools", "tvl", "prices")) -> Dict[str, int]:
+        """
+        Run every unfinished backfill task of the selected kinds.
+
+        Args:
+            kinds (Iterable[str]): Any of "pools", "tvl" and "prices".
+
+        Returns:
+            Dict[str, int]: Counters for completed, skipped and failed tasks and points written.
+        """
+        kinds = set(kinds)
+        window = self.window
+        tasks = []
+
+        if "pools" in kinds:
+            pools = await fetch_yield_pools(chain=self.llama_chain, projects=self.projects)
+            tasks += [
+                self._run_task(f"pool:{pool['pool']}:{window}", lambda pool_id=pool["pool"]: self.backfill_pool(pool_id))
+                for pool in pools
+                if pool.get("pool")
+            ]
+
+        if "tvl" in kinds:
+            tasks += [
+                self._run_task(f"tvl:{self.chain}:{slug}:{window}", lambda slug=slug: self.backfill_protocol_tvl(slug))
+                for slug in self.projects
+            ]
+
+        if "prices" in kinds:
+            coin_ids = [f"{CHAINS[self.chain]['coin_prefix']}:{address}" for address in CHAINS[self.chain]["tokens"].values()]
+            period = BACKFILL_CONFIG["price_period"]
+            chunk = BACKFILL_CONFIG["price_chunk_days"] * 24 * 60 * 60
+            for chunk_start in range(self.start, self.end, chunk):
+                chunk_end = min(chunk_start + chunk - 1, self.end)
+                tasks.append(self._run_task(
+                    f"prices:{self.chain}:{period}:{chunk_start}:{window}",
+                    lambda s=chunk_start, e=chunk_end: self.backfill_prices(coin_ids, s, e, period),
+                ))
+
+        logger.info(f"Backfilling {len(tasks)} tasks from {self.start} to {self.end}")
+        started = time.monotonic()
+        await asyncio.gather(*tasks)
+        logger.info(f"Backfill finished in {time.monotonic() - started:.1f}s: {self.stats}")
+        return self.stats
+
+
+def _parse_date(value: str, end_of_day: bool = False) -> int:
+    start = int(datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp())
+    return start + 24 * 60 * 60 - 1 if end_of_day else start
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill historical pool, TVL and price data.")
+    parser.add_argument("--start", required=True, help="Start date (YYYY-MM-DD, UTC).")
+    parser.add_argument("--end", help="End date (YYYY-MM-DD, UTC), inclusive. Defaults to now.")
+    parser.add_argument("--chain", default=DEFAULT_CHAIN, choices=list(CHAINS))
+    parser.add_argument("--concurrency", type=int, default=BACKFILL_CONFIG["max_concurrency"])
+    parser.add_argument("--only", nargs="+", choices=["pools", "tvl", "prices"], default=["pools", "tvl", "prices"])
+    parser.add_argument("--reset", action="store_true", help="Ignore and clear the checkpoint.")
+    args = parser.parse_args(argv)
+
+    checkpoint = BackfillCheckpoint(BACKFILL_CONFIG["checkpoint_path"])
+    if args.reset:
+        checkpoint.reset()
+    job = BackfillJob(
+        start=_parse_date(args.start),
+        end=_parse_date(args.end, end_of_day=True) if args.end else int(time.time()),
+        chain=args.chain,
+        max_concurrency=args.concurrency,
+        checkpoint=checkpoint,
+        window=f"{args.start}:{args.end or 'now'}",
+    )
+    try:
+        await job.run(args.only)
+    finally:
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,8 @@
 import logging
+from app.config.chains_config import ENABLED_CHAINS
 from app.services.market_service import MarketService
+from app.services.pool_history_service import PoolHistoryService
+from app.services.vector_service import VectorService
 
 logger = logging.getLogger("market_job")
 logging.basicConfig(level=logging.INFO)
@@ -17,13 +20,21 @@ class MarketDataJob:
         try:
             logger.info("Starting market data fetch job...")
 
-            market_data = await MarketService.fetch_market_data()
-            
-            if market_data:
-                await MarketService.save_market_data(market_data)
-                logger.info("Market data saved successfully!", market_data)
-            else:
+            snapshots = await MarketService.fetch_all_market_data()
+
+            if not snapshots:
                 logger.warning("No market data to save.")
+            for market_data in snapshots:
+                try:
+                    await MarketService.save_market_data(market_data)
+                    logger.info(f"Market data for {market_data.get('chain')} saved successfully!")
+                except Exception as e:
+                    logger.error(f"Error saving market data for {market_data.get('chain')}: {e}")
+            # Index every shard of this run in one bulk write.
+            await VectorService.flush()
+
+            for chain in ENABLED_CHAINS:
+                await PoolHistoryService.sync_pool_history(chain=chain)
 
         except Exception as e:
             logger.error(f"Error fetching and saving market data: {e}")
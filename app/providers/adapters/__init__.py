@@ -0,0 +1,6 @@
+from app.providers.adapters.moonwell_adapter import MoonwellAdapter
+from app.providers.adapters.morpho_adapter import MorphoAdapter
+from app.providers.registry import register_adapter
+
+register_adapter(MoonwellAdapter())
+register_adapter(MorphoAdapter())
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from typing import Any, Dict
+
+import numpy as np
+
+from app.config.api_config import API_ENDPOINTS
+from app.config.protocols_config import PROVIDER_SETTINGS
+from app.evm.client import get_web3_client, rpc_available
+from app.evm.moonwell_reader import read_moonwell_markets
+from app.providers.registry import MarketContext, ProtocolAdapter
+from app.providers.types.market_types import Market
+
+logger = logging.getLogger("MOONWELL_ADAPTER")
+
+
+class MoonwellAdapter(ProtocolAdapter):
+    """
+    Moonwell lending markets.
+
+    When an RPC endpoint is configured, per-market rates, balances and
+    collateral factors are read on-chain in one Multicall3 batch; otherwise
+    (or if that read fails) markets are approximated from DeFi Llama yields
+    and protocol-wide TVL.
+    """
+
+    name = "moonwell"
+    deadline = PROVIDER_SETTINGS["moonwell"]["deadline"]
+    yield_projects = PROVIDER_SETTINGS["moonwell"]["yield_projects"]
+
+    def endpoints(self) -> Dict[str, str]:
+        return {"protocol": f"{API_ENDPOINTS['DEFI_LLAMA']}/protocol/moonwell"}
+
+    async def build(self, responses: Dict[str, Any], context: MarketContext) -> Dict[str, Any]:
+        if rpc_available(context.chain):
+            try:
+                return {"markets": await self.build_onchain(context)}
+            except Exception as e:
+                logger.error(f"On-chain Moonwell read failed, falling back to DeFi Llama: {e}")
+        return {"markets": self.build_from_llama(responses, context)}
+
+    async def build_onchain(self, context: MarketContext) -> Dict[str, Market]:
+        w3 = await asyncio.to_thread(get_web3_client, context.chain)
+        states = await read_moonwell_markets(w3, context.blockNumber, chain=context.chain)
+        coins = context.prices.get("coins", {}) if isinstance(context.prices, dict) else {}
+
+        markets: Dict[str, Market] = {}
+        for token in context.tokens:
+            state = states.get(token) or next(
+                (s for address, s in states.items() if address.lower() == token.lower()), None
+            )
+            if state is None:
+                continue
+            price = float(coins.get(context.coin_id(token), {}).get("price", 0))
+            markets[token] = Market(
+                supplyRate=state.supplyApy,
+                borrowRate=state.borrowApy,
+                totalSupply=state.totalSupply * price,
+                totalBorrow=state.totalBorrows * price,
+                liquidity=state.cash * price,
+                collateralFactor=state.collateralFactor,
+            )
+        return markets
+
+    def build_from_llama(self, responses: Dict[str, Any], context: MarketContext) -> Dict[str, Market]:
+        pools = context.pool_table.filter(project=self.yield_projects, token=context.tokens)
+        token_by_lower = {address.lower(): address for address in context.tokens}
+
+        chain_tvls = responses["protocol"].get("currentChainTvls", {})
+        chain_tvl = chain_tvls.get(context.llama_chain, 0) if isinstance(chain_tvls, dict) else 0
+        chain_borrowed = chain_tvls.get(f"{context.llama_chain}-borrowed", 0) if isinstance(chain_tvls, dict) else 0
+
+        markets: Dict[str, Market] = {}
+        for token, apy, apy_base in zip(
+            pools["token"].tolist(),
+            np.nan_to_num(pools["apy"]).tolist(),
+            np.nan_to_num(pools["apyBase"]).tolist(),
+        ):
+            markets[token_by_lower[token]] = Market(
+                supplyRate=apy_base,
+                borrowRate=apy - apy_base,
+                totalSupply=float(chain_tvl),
+                totalBorrow=float(chain_borrowed),
+                liquidity=float(max(0, chain_tvl - chain_borrowed)),
+                collateralFactor=0.8,
+            )
+        return markets
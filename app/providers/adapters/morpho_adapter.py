@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from typing import Any, Dict
+
+import numpy as np
+
+from app.config.protocols_config import PROVIDER_SETTINGS
+from app.evm.client import get_web3_client, rpc_available
+from app.evm.morpho_reader import read_morpho_vaults
+from app.providers.registry import MarketContext, ProtocolAdapter
+from app.providers.types.market_types import Vault
+
+logger = logging.getLogger("MORPHO_ADAPTER")
+
+
+class MorphoAdapter(ProtocolAdapter):
+    """
+    Morpho (MetaMorpho) vaults.
+
+    With an RPC endpoint, the configured vaults are read on-chain in batched
+    Multicall3 calls and keyed by vault address; APY falls back to the DeFi
+    Llama pool of the same vault when the share-price history is unavailable.
+    Without RPC, vaults are taken from DeFi Llama yields and keyed by pool id.
+    """
+
+    name = "morpho"
+    deadline = PROVIDER_SETTINGS["morpho"]["deadline"]
+    yield_projects = PROVIDER_SETTINGS["morpho"]["yield_projects"]
+
+    async def build(self, responses: Dict[str, Any], context: MarketContext) -> Dict[str, Any]:
+        if rpc_available(context.chain):
+            try:
+                return {"vaults": await self.build_onchain(context)}
+            except Exception as e:
+                logger.error(f"On-chain Morpho read failed, falling back to DeFi Llama: {e}")
+        return {"vaults": self.build_from_llama(context)}
+
+    async def build_onchain(self, context: MarketContext) -> Dict[str, Vault]:
+        w3 = await asyncio.to_thread(get_web3_client, context.chain)
+        states = await read_morpho_vaults(w3, context.blockNumber, chain=context.chain)
+        coins = context.prices.get("coins", {}) if isinstance(context.prices, dict) else {}
+        token_by_lower = {address.lower(): address for address in context.tokens}
+
+        vaults: Dict[str, Vault] = {}
+        for address, state in states.items():
+            token = token_by_lower.get(state.asset.lower())
+            if token is None:
+                continue
+            apy = state.apy
+            if apy is None:
+                pool = context.pool_table.get(address.lower()) or context.pool_table.get(address)
+                apy = pool["apy"] if pool and not np.isnan(pool["apy"]) else 0.0
+            price = float(coins.get(context.coin_id(token), {}).get("price", 0))
+            vaults[address] = Vault(
+                apy=apy,
+                tvl=state.totalAssets * price,
+                token=token,
+                performanceFee=state.performanceFee,
+                timelock=state.timelock,
+            )
+        return vaults
+
+    def build_from_llama(self, context: MarketContext) -> Dict[str, Vault]:
+        pools = context.pool_table.filter(project=self.yield_projects, token=context.tokens)
+        token_by_lower = {address.lower(): address for address in context.tokens}
+
+        vaults: Dict[str, Vault] = {}
+        for pool_id, token, apy, tvl in zip(
+            pools["pool"].tolist(),
+            pools["token"].tolist(),
+            np.nan_to_num(pools["apy"]).tolist(),
+            np.nan_to_num(pools["tvlUsd"]).tolist(),
+        ):
+            vaults[pool_id] = Vault(
+                apy=apy,
+                tvl=tvl,
+                token=token_by_lower[token],
+                performanceFee=0.0,
+                timelock=0,
+            )
+        return vaults
@@ -1,50 +1,210 @@
 import asyncio
 import logging
-from typing import List, Dict, Any, Tuple
-from app.config.addresses_config import BASE_TOKENS
+import time
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List, Dict, Any, Optional, Tuple
+from app.config.chains_config import CHAINS, DEFAULT_CHAIN, ENABLED_CHAINS
+from app.config.api_config import API_ENDPOINTS
+from app.config.cache_config import PRICE_CACHE_TTLS
+from app.config.protocols_config import SNAPSHOT_SETTINGS
+from app.evm.client import get_web3_client, rpc_available
+from app.evm.head_tracker import get_head_tracker
+from app.evm.token_registry import get_token_registry
+import app.providers.adapters  # noqa: F401  registers the built-in adapters
+from app.providers.pool_universe import get_pool_universe
+from app.providers.registry import MarketContext, collect_protocols, get_adapters
 from app.providers.types.common import PriceChange, RiskMetrics, Token
-from app.providers.types.market_types import CoinsResponse, Market, MarketData
-from app.utils.api_client import fetch_with_retry
-
-API_ENDPOINTS = {
-    "DEFI_LLAMA": "https://api.llama.fi",
-    "COINS_API": "https://coins.llama.fi",
-    "YIELDS_API": "https://yields.llama.fi",
-}
-
+from app.providers.types.market_types import CoinsResponse, MarketData
+from app.services.price_history_service import PRICE_CHANGE_PERIODS, PriceHistoryService
+from app.utils.api_client import fetch_with_retry, stream_json_items
+from app.utils.ttl_cache import TTLCache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("DEFI_LLAMA_PROVIDER")
 
+price_cache = TTLCache("coins")
+
+
+async def fetch_coins_endpoint(url: str, period: str) -> Any:
+    """
+    Fetch a coins.llama.fi endpoint through the per-period price cache.
+
+    Args:
+        url (str): Endpoint URL.
+        period (str): Freshness profile from ``PRICE_CACHE_TTLS`` ("current", "24h", "7d", "30d").
+
+    Returns:
+        Any: JSON response, possibly served stale while a refresh runs.
+    """
+    return await price_cache.get_or_fetch(
+        url, lambda: fetch_with_retry(url), **PRICE_CACHE_TTLS[period]
+    )
+
+
+async def stream_yield_pools(
+    chain: Optional[str] = None, projects: Optional[Iterable[str]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream the DeFi Llama yield pools, keeping only those matching chain/project.
+
+    Args:
+        chain (Optional[str]): DeFi Llama chain name to keep (e.g. "Base").
+        projects (Optional[Iterable[str]]): Project slugs to keep (e.g. "moonwell").
+
+    Yields:
+        Dict[str, Any]: Raw pool entries from the ``/pools`` response.
+    """
+    project_set = set(projects) if projects is not None else None
+
+    def matches(pool: Any) -> bool:
+        if not isinstance(pool, dict):
+            return False
+        if chain is not None and pool.get("chain") != chain:
+            return False
+        return project_set is None or pool.get("project") in project_set
+
+    async for pool in stream_json_items(f"{API_ENDPOINTS['YIELDS_API']}/pools", predicate=matches):
+        yield pool
+
+
+async def fetch_yield_pools(
+    chain: Optional[str] = None, projects: Optional[Iterable[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Collect the streamed yield pools matching chain/project into a list.
+    """
+    return [pool async for pool in stream_yield_pools(chain, projects)]
 
-async def fetch_token_prices_and_changes(tokens: List[str]) -> Tuple[CoinsResponse, Dict[str, PriceChange]]:
-    token_ids = ",".join([f"base:{token}" for token in tokens])
 
-    urls = {
-        "prices": f"{API_ENDPOINTS['COINS_API']}/prices/current/{token_ids}",
-        "day_changes": f"{API_ENDPOINTS['COINS_API']}/percentage/{token_ids}?period=24h",
-        "week_changes": f"{API_ENDPOINTS['COINS_API']}/percentage/{token_ids}?period=7d",
-        "month_changes": f"{API_ENDPOINTS['COINS_API']}/percentage/{token_ids}?period=30d",
+def _parse_timestamp(value: Any) -> int:
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp())
+
+
+async def fetch_pool_chart(pool_id: str) -> List[Dict[str, Any]]:
+    """
+    Fetch the full APY/TVL history of a yield pool.
+
+    Args:
+        pool_id (str): DeFi Llama pool identifier.
+
+    Returns:
+        List[Dict[str, Any]]: Points with a unix ``timestamp`` and the chart fields.
+    """
+    response = await fetch_with_retry(f"{API_ENDPOINTS['YIELDS_API']}/chart/{pool_id}", timeout=30)
+    return [
+        {**point, "timestamp": _parse_timestamp(point["timestamp"])}
+        for point in response.get("data", [])
+        if point.get("timestamp") is not None
+    ]
+
+
+async def fetch_price_chart(
+    coin_ids: List[str], start: int, span: int, period: str = "1h"
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch historical prices of several coins for one window.
+
+    Args:
+        coin_ids (List[str]): DeFi Llama coin ids (e.g. ``base:0x...``).
+        start (int): Unix time of the first point.
+        span (int): Number of points to return.
+        period (str): Spacing between points, e.g. "1h" or "1d". Defaults to "1h".
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: Points with ``timestamp`` and ``price`` per coin id.
+    """
+    response = await fetch_with_retry(
+        f"{API_ENDPOINTS['COINS_API']}/chart/{','.join(coin_ids)}",
+        params={"start": start, "span": span, "period": period},
+        timeout=30,
+    )
+    return {
+        coin_id: data.get("prices", [])
+        for coin_id, data in response.get("coins", {}).items()
     }
 
+
+async def fetch_protocol_tvl(slug: str, chain: str = "Base") -> List[Dict[str, Any]]:
+    """
+    Fetch the daily TVL history of a protocol on one chain.
+
+    Args:
+        slug (str): DeFi Llama protocol slug.
+        chain (str): Chain name as used in ``chainTvls``. Defaults to "Base".
+
+    Returns:
+        List[Dict[str, Any]]: Points with a unix ``timestamp`` and ``tvlUsd``.
+    """
+    response = await fetch_with_retry(f"{API_ENDPOINTS['DEFI_LLAMA']}/protocol/{slug}", timeout=30)
+    points = response.get("chainTvls", {}).get(chain, {}).get("tvl", [])
+    return [
+        {"timestamp": int(point["date"]), "tvlUsd": point.get("totalLiquidityUSD")}
+        for point in points
+        if point.get("date") is not None
+    ]
+
+
+def _coin_percentage(response: Any, coin_id: str) -> float:
+    value = response.get("coins", {}).get(coin_id, 0) if isinstance(response, dict) else response
+    if isinstance(value, dict):
+        value = value.get("percentage", 0)
+    return float(value or 0)
+
+
+async def fetch_token_prices_and_changes(
+    tokens: List[str], chain: str = DEFAULT_CHAIN
+) -> Tuple[CoinsResponse, Dict[str, PriceChange]]:
+    """
+    Fetch current prices and 24h/7d/30d price changes for tokens on one chain.
+
+    Prices are recorded into the local price history on every call, and
+    changes are derived from that history. The coins.llama.fi percentage
+    endpoint is only called for periods where local history is missing, and
+    only for the affected coins.
+
+    Args:
+        tokens (List[str]): Token addresses on the chain.
+        chain (str): Key of ``CHAINS``. Defaults to "base".
+
+    Returns:
+        Tuple[CoinsResponse, Dict[str, PriceChange]]: Raw prices response and changes per token.
+    """
+    coin_ids = {token: f"{CHAINS[chain]['coin_prefix']}:{token}" for token in tokens}
+    token_ids = ",".join(coin_ids.values())
+
     try:
-        prices, day_changes, week_changes, month_changes = await asyncio.gather(
-            fetch_with_retry(urls["prices"]),
-            fetch_with_retry(urls["day_changes"]),
-            fetch_with_retry(urls["week_changes"]),
-            fetch_with_retry(urls["month_changes"]),
-        )
+        prices = await fetch_coins_endpoint(f"{API_ENDPOINTS['COINS_API']}/prices/current/{token_ids}", "current")
+        PriceHistoryService.record_prices(prices.get("coins", {}) if isinstance(prices, dict) else {})
+        local_changes = PriceHistoryService.compute_changes(coin_ids.values())
+
+        missing = {
+            period: [coin_id for coin_id in coin_ids.values() if local_changes[coin_id][period] is None]
+            for period in PRICE_CHANGE_PERIODS
+        }
+        remote_periods = [period for period, coins in missing.items() if coins]
+        remote_responses = await asyncio.gather(*(
+            fetch_coins_endpoint(
+                f"{API_ENDPOINTS['COINS_API']}/percentage/{','.join(missing[period])}?period={period}", period
+            )
+            for period in remote_periods
+        ))
+        remote = dict(zip(remote_periods, remote_responses))
+        if remote_periods:
+            logger.info(f"Price history incomplete, fetched remote changes for: {remote_periods}")
+
+        def change(coin_id: str, period: str) -> float:
+            local = local_changes[coin_id][period]
+            return local if local is not None else _coin_percentage(remote.get(period, {}), coin_id)
 
         changes: Dict[str, PriceChange] = {}
-        for token in tokens:
+        for token, coin_id in coin_ids.items():
             try:
                 changes[token] = PriceChange(
-                    day_24h=float(day_changes if isinstance(day_changes, (int, float)) 
-                                else day_changes.get("coins", {}).get(f"base:{token}", {}).get("percentage", 0)),
-                    week_7d=float(week_changes if isinstance(week_changes, (int, float))
-                                else week_changes.get("coins", {}).get(f"base:{token}", {}).get("percentage", 0)),
-                    month_30d=float(month_changes if isinstance(month_changes, (int, float))
-                                  else month_changes.get("coins", {}).get(f"base:{token}", {}).get("percentage", 0))
+                    day_24h=change(coin_id, "24h"),
+                    week_7d=change(coin_id, "7d"),
+                    month_30d=change(coin_id, "30d"),
                 )
             except Exception as e:
                 logger.error(f"Error processing changes for token {token}: {e}")
@@ -54,63 +214,108 @@ async def fetch_token_prices_and_changes(tokens: List[str]) -> Tuple[CoinsRespon
     except Exception as e:
         logger.error(f"Error in fetch_token_prices_and_changes: {e}")
         return {}
-async def fetch_defi_data() -> List[MarketData]:
-    try:
-        protocols = ["moonwell", "morpho"]
-        tokens = list(BASE_TOKENS.values())
 
-        protocol_tasks = [
-            fetch_with_retry(f"{API_ENDPOINTS['DEFI_LLAMA']}/protocol/{protocol}")
-            for protocol in protocols
-        ]
-        yield_pools_task = fetch_with_retry(f"{API_ENDPOINTS['YIELDS_API']}/pools")
-        token_data_task = fetch_token_prices_and_changes(tokens)
 
-        protocol_responses, yield_pools, (prices, changes) = await asyncio.gather(
-            asyncio.gather(*protocol_tasks), yield_pools_task, token_data_task
-        )
+async def load_market_context(
+    tokens: List[str],
+    projects: List[str],
+    chain: str = DEFAULT_CHAIN,
+    deadline: float = SNAPSHOT_SETTINGS["context_deadline"],
+) -> MarketContext:
+    """
+    Fetch the data shared by all protocol adapters for one chain's snapshot.
 
-        base_yields = [
-            pool for pool in yield_pools.get("data", [])
-            if pool.get("chain") == "Base" and pool.get("project") in ["moonwell", "morpho"]
-        ]
+    Every pool on the chain is streamed into its ``PoolUniverse``; the
+    adapters' pool table is then read from its token index. A failing pools
+    fetch keeps the previous universe, and a failing prices fetch degrades to
+    empty data, instead of failing every adapter. Each part is bounded by
+    ``deadline``; one that misses it counts as failed, so the context is
+    ready within the deadline even when an upstream API stalls.
 
-        moonwell_markets: Dict[str, Market] = {}
-        for pool in base_yields:
-            if pool.get("project") == "moonwell" and pool.get("underlyingTokens", [{}])[0] in BASE_TOKENS.values():
-                token = pool["underlyingTokens"][0]
-                protocol_data = protocol_responses[0]
-                chain_tvls = protocol_data.get("currentChainTvls", {})
-
-                base_tvl = chain_tvls.get("Base", 0) if isinstance(chain_tvls, dict) else 0
-                base_borrowed = chain_tvls.get("Base-borrowed", 0) if isinstance(chain_tvls, dict) else 0
-                
-                apy_base = float(pool.get("apyBase", 0))
-                apy = float(pool.get("apy", 0))
-                
-                moonwell_markets[token] = Market(
-                    supplyRate=apy_base,
-                    borrowRate=apy - apy_base,
-                    totalSupply=float(base_tvl),
-                    totalBorrow=float(base_borrowed),
-                    liquidity=float(max(0, base_tvl - base_borrowed)),
-                    collateralFactor=0.8,
-                )
+    Args:
+        tokens (List[str]): Token addresses to price.
+        projects (List[str]): DeFi Llama yields project slugs the adapters read.
+        chain (str): Key of ``CHAINS``. Defaults to "base".
+        deadline (float): Seconds each part may take. Defaults to ``SNAPSHOT_SETTINGS["context_deadline"]``.
+
+    Returns:
+        MarketContext: Pool table, prices, price changes and the head block readers pin to.
+    """
+    universe = get_pool_universe(chain)
+    registry = get_token_registry(chain)
+
+    async def read_head() -> Optional[int]:
+        if not rpc_available(chain):
+            return None
+        return (await get_head_tracker(chain).latest()).number
+
+    async def resolve_tokens() -> None:
+        if rpc_available(chain) and any(registry.get(token) is None for token in tokens):
+            await registry.resolve(tokens, await asyncio.to_thread(get_web3_client, chain))
+
+    pools, token_data, block_number, resolved = await asyncio.gather(
+        asyncio.wait_for(fetch_yield_pools(chain=CHAINS[chain]["llama_name"]), deadline),
+        asyncio.wait_for(fetch_token_prices_and_changes(tokens, chain), deadline),
+        asyncio.wait_for(read_head(), deadline),
+        asyncio.wait_for(resolve_tokens(), deadline),
+        return_exceptions=True,
+    )
+    if isinstance(block_number, BaseException):
+        logger.error(f"Error reading {chain} chain head: {block_number!r}")
+        block_number = None
+    if isinstance(resolved, BaseException):
+        logger.error(f"Error resolving token metadata: {resolved!r}")
+    if isinstance(pools, BaseException):
+        logger.error(f"Error fetching yield pools, keeping the previous pool universe: {pools!r}")
+    else:
+        stats = universe.update(pools)
+        logger.info(f"Pool universe for {chain} updated: {stats}")
+    if isinstance(token_data, BaseException) or not isinstance(token_data, tuple):
+        logger.error(f"Error fetching token prices: {token_data!r}")
+        token_data = ({"coins": {}}, {})
+    prices, changes = token_data
+    return MarketContext(
+        tokens=tokens,
+        pool_table=universe.table(tokens).filter(project=projects),
+        prices=prices,
+        changes=changes,
+        blockNumber=block_number,
+        chain=chain,
+    )
+
+
+async def fetch_defi_data(protocols: Optional[List[str]] = None, chain: str = DEFAULT_CHAIN) -> List[MarketData]:
+    try:
+        adapters = get_adapters(protocols, chain)
+        if not adapters:
+            logger.warning(f"No protocol adapter supports {chain}; skipping its market snapshot")
+            return []
+        tokens = list(CHAINS[chain]["tokens"].values())
+        projects = sorted({project for adapter in adapters for project in adapter.yield_projects})
+        registry = get_token_registry(chain)
+
+        context_task = asyncio.ensure_future(load_market_context(tokens, projects, chain))
+        protocols_data = await collect_protocols(adapters, context_task)
+        context = await context_task
+        prices, changes = context.prices, context.changes
+        now = int(time.time())
+        moonwell_markets = protocols_data.get("moonwell", {}).get("markets", {})
 
         tokens_data: Dict[str, Token] = {}
         prices_data = prices if isinstance(prices, dict) else {"coins": {}}
         
-        for address in BASE_TOKENS.values():
-            coin_key = f"base:{address}"
+        for address in tokens:
+            coin_key = context.coin_id(address)
             coins_data = prices_data.get("coins", {})
             price_data = coins_data.get(coin_key, {})
             price_change = changes.get(address, PriceChange(0, 0, 0))
+            metadata = registry.get(address)
             
             tokens_data[address] = Token(
                 price=float(price_data.get("price", 0)),
                 priceChange=price_change,
-                decimals=6 if address == BASE_TOKENS["USDC"] else 18,
-                symbol=price_data.get("symbol", ""),
+                decimals=metadata.decimals if metadata else int(price_data.get("decimals", 18)),
+                symbol=metadata.symbol if metadata else price_data.get("symbol", ""),
                 totalSupply=0,
             )
 
@@ -120,32 +325,46 @@ async def fetch_defi_data() -> List[MarketData]:
                 volume24hUSD=0,
                 uniqueUsers24h=0,
                 healthFactor=0.85,
-                lastUpdate=int(asyncio.get_running_loop().time()),
+                lastUpdate=now,
             )
             for address in tokens
         }
 
         return [
             MarketData(
-                timestamp=int(asyncio.get_running_loop().time()),
-                blockNumber=18000000,
-                protocols={
-                    "moonwell": {"markets": moonwell_markets},
-                },
+                timestamp=now,
+                blockNumber=context.blockNumber or 0,
+                protocols=protocols_data,
                 tokens=tokens_data,
                 riskMetrics=risk_metrics,
+                chain=chain,
             )
         ]
     except Exception as e:
-        logger.error(f"Error in fetch_defi_data: {str(e)}")
+        logger.error(f"Error in fetch_defi_data for {chain}: {str(e)}")
         import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise Exception(f"Error fetching DeFi data: {str(e)}")
 
 
-async def get_market_data() -> List[MarketData]:
-    try:
-        return await fetch_defi_data()
-    except Exception as e:
-        logger.error(f"Failed to fetch market data: {str(e)}")
-        return []
\ No newline at end of file
+async def get_market_data(chains: Optional[List[str]] = None) -> List[MarketData]:
+    """
+    Ingest market data for each chain as an independent, concurrent shard.
+
+    A failing chain only drops its own snapshot.
+
+    Args:
+        chains (Optional[List[str]]): Keys of ``CHAINS``. Defaults to ``ENABLED_CHAINS``.
+
+    Returns:
+        List[MarketData]: One snapshot per chain that succeeded.
+    """
+    chains = chains or ENABLED_CHAINS
+    results = await asyncio.gather(*(fetch_defi_data(chain=chain) for chain in chains), return_exceptions=True)
+    market_data: List[MarketData] = []
+    for chain, result in zip(chains, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to fetch market data for {chain}: {str(result)}")
+            continue
+        market_data.extend(result)
+    return market_data
\ No newline at end of file
@@ -0,0 +1,183 @@
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+NUMERIC_COLUMNS = (
+    "tvlUsd",
+    "apy",
+    "apyBase",
+    "apyReward",
+    "apyPct1D",
+    "apyPct7D",
+    "apyPct30D",
+    "mu",
+    "sigma",
+    "apyMean30d",
+    "volumeUsd1d",
+)
+STRING_COLUMNS = ("pool", "chain", "project", "symbol", "token")
+BOOL_COLUMNS = ("stablecoin", "outlier")
+
+StrFilter = Optional[Union[str, Iterable[str]]]
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _underlying_token(pool: Dict[str, Any]) -> str:
+    tokens = pool.get("underlyingTokens") or []
+    return str(tokens[0]).lower() if tokens and tokens[0] else ""
+
+
+class PoolTable:
+    """
+    Columnar, NumPy-backed view of DeFi Llama yield pools.
+
+    Each ``LlamaPool`` field we rank or filter on is stored as one array, so
+    screening and ranking thousands of pools is a handful of vectorized
+    operations. ``token`` holds the lower-cased first underlying token.
+    Missing numeric values are NaN.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+        self._index: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_pools(cls, pools: Iterable[Dict[str, Any]]) -> "PoolTable":
+        """
+        Build a table from raw ``/pools`` entries.
+
+        Args:
+            pools (Iterable[Dict[str, Any]]): Pool dictionaries as returned by DeFi Llama.
+
+        Returns:
+            PoolTable: Table with one row per pool.
+        """
+        pools = list(pools)
+        columns: Dict[str, np.ndarray] = {}
+        for name in ("pool", "chain", "project", "symbol"):
+            columns[name] = np.array([str(p.get(name) or "") for p in pools], dtype=str)
+        columns["token"] = np.array([_underlying_token(p) for p in pools], dtype=str)
+        for name in NUMERIC_COLUMNS:
+            columns[name] = np.fromiter((_as_float(p.get(name)) for p in pools), dtype=np.float64, count=len(pools))
+        for name in BOOL_COLUMNS:
+            columns[name] = np.fromiter((bool(p.get(name)) for p in pools), dtype=bool, count=len(pools))
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns["pool"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def take(self, rows: np.ndarray) -> "PoolTable":
+        """
+        Return a new table with the given row positions or boolean mask.
+        """
+        return PoolTable({name: column[rows] for name, column in self.columns.items()})
+
+    def mask(
+        self,
+        chain: StrFilter = None,
+        project: StrFilter = None,
+        token: StrFilter = None,
+        min_tvl: Optional[float] = None,
+        stablecoin: Optional[bool] = None,
+    ) -> np.ndarray:
+        """
+        Compute the boolean row mask for the given filters.
+
+        Args:
+            chain (StrFilter): Chain name or names to keep.
+            project (StrFilter): Project slug or slugs to keep.
+            token (StrFilter): Underlying token address or addresses to keep (case-insensitive).
+            min_tvl (Optional[float]): Minimum ``tvlUsd``.
+            stablecoin (Optional[bool]): Keep only stablecoin (or non-stablecoin) pools.
+
+        Returns:
+            np.ndarray: Boolean mask with one entry per row.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for name, value in (("chain", chain), ("project", project), ("token", token)):
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            if name == "token":
+                values = [v.lower() for v in values]
+            mask &= np.isin(self.columns[name], values)
+        if min_tvl is not None:
+            mask &= self.columns["tvlUsd"] >= min_tvl
+        if stablecoin is not None:
+            mask &= self.columns["stablecoin"] == stablecoin
+        return mask
+
+    def filter(self, **filters: Any) -> "PoolTable":
+        """
+        Return the rows matching the filters accepted by ``mask``.
+        """
+        return self.take(self.mask(**filters))
+
+    def risk_adjusted_apy(self, risk_aversion: float = 1.0) -> np.ndarray:
+        """
+        Compute APY penalised by its historical volatility.
+
+        Args:
+            risk_aversion (float): Weight of ``sigma`` subtracted from ``apy``. Defaults to 1.0.
+
+        Returns:
+            np.ndarray: ``apy - risk_aversion * sigma`` per row; NaN APYs rank last.
+        """
+        apy = np.nan_to_num(self.columns["apy"], nan=-np.inf)
+        sigma = np.nan_to_num(self.columns["sigma"], nan=0.0)
+        return apy - risk_aversion * sigma
+
+    def top_k(self, k: int, by: str = "risk_adjusted", risk_aversion: float = 1.0) -> "PoolTable":
+        """
+        Return the ``k`` best rows, ordered best first.
+
+        Args:
+            k (int): Number of rows to keep.
+            by (str): Numeric column to rank on, or "risk_adjusted". Defaults to "risk_adjusted".
+            risk_aversion (float): Volatility penalty used by "risk_adjusted". Defaults to 1.0.
+
+        Returns:
+            PoolTable: Top rows in descending score order.
+        """
+        if by == "risk_adjusted":
+            scores = self.risk_adjusted_apy(risk_aversion)
+        else:
+            scores = np.nan_to_num(self.columns[by], nan=-np.inf)
+        k = min(k, len(self))
+        if k <= 0:
+            return self.take(np.array([], dtype=np.intp))
+        top = np.argpartition(-scores, k - 1)[:k]
+        return self.take(top[np.argsort(-scores[top], kind="stable")])
+
+    def row(self, position: int) -> Dict[str, Any]:
+        """
+        Return one row as a dictionary of plain Python values.
+        """
+        return {name: column[position].item() for name, column in self.columns.items()}
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return [self.row(i) for i in range(len(self))]
+
+    def get(self, pool_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a pool by its DeFi Llama pool id.
+
+        Args:
+            pool_id (str): Pool identifier.
+
+        Returns:
+            Optional[Dict[str, Any]]: Row values, or None if absent.
+        """
+        if self._index is None:
+            self._index = {pool: i for i, pool in enumerate(self.columns["pool"].tolist())}
+        position = self._index.get(pool_id)
+        return None if position is None else self.row(position)
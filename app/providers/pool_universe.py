@@ -0,0 +1,171 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.config.chains_config import DEFAULT_CHAIN
+from app.providers.pool_table import PoolTable, StrFilter
+
+
+def _pool_tokens(pool: Dict[str, Any]) -> Set[str]:
+    return {str(token).lower() for token in pool.get("underlyingTokens") or [] if token}
+
+
+class PoolUniverse:
+    """
+    Indexed set of every yield pool on one chain, updated incrementally.
+
+    Pools are indexed by pool id, by every underlying token (lower-cased) and
+    by project, so token and project lookups are dictionary hits. Each ingest
+    only re-indexes pools that were added, changed or removed, and the
+    per-token ``PoolTable`` used for ranking is rebuilt only when one of that
+    token's pools changed.
+    """
+
+    def __init__(self):
+        self._pools: Dict[str, Dict[str, Any]] = {}
+        self._by_token: Dict[str, Set[str]] = {}
+        self._by_project: Dict[str, Set[str]] = {}
+        self._tables: Dict[str, PoolTable] = {}
+        self._lock = threading.Lock()
+        self.version = 0
+        self.updated_at: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def _index(self, pool_id: str, pool: Dict[str, Any]) -> None:
+        self._pools[pool_id] = pool
+        for token in _pool_tokens(pool):
+            self._by_token.setdefault(token, set()).add(pool_id)
+            self._tables.pop(token, None)
+        self._by_project.setdefault(pool.get("project") or "", set()).add(pool_id)
+
+    def _unindex(self, pool_id: str) -> None:
+        pool = self._pools.pop(pool_id)
+        for token in _pool_tokens(pool):
+            ids = self._by_token.get(token, set())
+            ids.discard(pool_id)
+            if not ids:
+                self._by_token.pop(token, None)
+            self._tables.pop(token, None)
+        ids = self._by_project.get(pool.get("project") or "", set())
+        ids.discard(pool_id)
+        if not ids:
+            self._by_project.pop(pool.get("project") or "", None)
+
+    def update(self, pools: Iterable[Dict[str, Any]], complete: bool = True) -> Dict[str, int]:
+        """
+        Apply an ingest of raw ``/pools`` entries.
+
+        Args:
+            pools (Iterable[Dict[str, Any]]): Pool dictionaries as returned by DeFi Llama.
+            complete (bool): Whether the ingest is the full pool list, so pools missing
+                from it are dropped. Defaults to True.
+
+        Returns:
+            Dict[str, int]: Number of pools added, updated, removed and unchanged.
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        with self._lock:
+            seen: Set[str] = set()
+            for pool in pools:
+                pool_id = pool.get("pool")
+                if not pool_id:
+                    continue
+                seen.add(pool_id)
+                current = self._pools.get(pool_id)
+                if current == pool:
+                    stats["unchanged"] += 1
+                    continue
+                if current is not None:
+                    self._unindex(pool_id)
+                self._index(pool_id, pool)
+                stats["updated" if current is not None else "added"] += 1
+            if complete:
+                for pool_id in [pool_id for pool_id in self._pools if pool_id not in seen]:
+                    self._unindex(pool_id)
+                    stats["removed"] += 1
+            if stats["added"] or stats["updated"] or stats["removed"]:
+                self.version += 1
+            self.updated_at = int(time.time())
+        return stats
+
+    def get(self, pool_id: str) -> Optional[Dict[str, Any]]:
+        return self._pools.get(pool_id)
+
+    def tokens(self) -> List[str]:
+        return list(self._by_token)
+
+    def projects(self) -> List[str]:
+        return list(self._by_project)
+
+    def pools_for_token(self, token: str) -> List[Dict[str, Any]]:
+        """
+        Return every pool with ``token`` among its underlying tokens.
+        """
+        return [self._pools[pool_id] for pool_id in self._by_token.get(token.lower(), ())]
+
+    def pools_for_project(self, project: str) -> List[Dict[str, Any]]:
+        return [self._pools[pool_id] for pool_id in self._by_project.get(project, ())]
+
+    def _token_table(self, token: str) -> PoolTable:
+        with self._lock:
+            table = self._tables.get(token)
+            if table is None:
+                table = PoolTable.from_pools(self._pools[i] for i in sorted(self._by_token.get(token, ())))
+                self._tables[token] = table
+            return table
+
+    def table(self, tokens: Optional[Iterable[str]] = None) -> PoolTable:
+        """
+        Return a ``PoolTable`` of the pools holding any of ``tokens``, or of all pools.
+        """
+        if tokens is None:
+            return PoolTable.from_pools(list(self._pools.values()))
+        ids: Set[str] = set()
+        for token in tokens:
+            ids |= self._by_token.get(token.lower(), set())
+        return PoolTable.from_pools(self._pools[i] for i in sorted(ids))
+
+    def best_pools(
+        self,
+        token: str,
+        k: int = 5,
+        project: StrFilter = None,
+        min_tvl: Optional[float] = None,
+        by: str = "risk_adjusted",
+        risk_aversion: float = 1.0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank the pools holding ``token``.
+
+        Args:
+            token (str): Underlying token address (case-insensitive).
+            k (int): Number of pools to return. Defaults to 5.
+            project (StrFilter): Project slug or slugs to keep.
+            min_tvl (Optional[float]): Minimum ``tvlUsd``.
+            by (str): Ranking passed to ``PoolTable.top_k``. Defaults to "risk_adjusted".
+            risk_aversion (float): Volatility penalty for "risk_adjusted". Defaults to 1.0.
+
+        Returns:
+            List[Dict[str, Any]]: Best pools first, as ``PoolTable`` rows.
+        """
+        table = self._token_table(token.lower())
+        if project is not None or min_tvl is not None:
+            table = table.filter(project=project, min_tvl=min_tvl)
+        return table.top_k(k, by=by, risk_aversion=risk_aversion).rows()
+
+
+_universes: Dict[str, PoolUniverse] = {}
+
+
+def get_pool_universe(chain: str = DEFAULT_CHAIN) -> PoolUniverse:
+    """
+    Return the pool universe of a chain.
+    """
+    if chain not in _universes:
+        _universes[chain] = PoolUniverse()
+    return _universes[chain]
+
+
+pool_universe = get_pool_universe(DEFAULT_CHAIN)
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, List, Optional
+
+from app.config.chains_config import CHAINS, DEFAULT_CHAIN
+from app.providers.pool_table import PoolTable
+from app.providers.types.common import PriceChange
+from app.providers.types.market_types import CoinsResponse
+from app.utils.api_client import fetch_with_retry
+
+logger = logging.getLogger("PROVIDER_REGISTRY")
+
+
+@dataclass
+class MarketContext:
+    """Data shared by all adapters for one snapshot of one chain."""
+    tokens: List[str]
+    pool_table: PoolTable
+    prices: CoinsResponse
+    changes: Dict[str, PriceChange]
+    blockNumber: Optional[int] = None
+    chain: str = DEFAULT_CHAIN
+
+    @property
+    def llama_chain(self) -> str:
+        return CHAINS[self.chain]["llama_name"]
+
+    def coin_id(self, address: str) -> str:
+        """
+        Return the DeFi Llama coin id of a token on this chain.
+        """
+        return f"{CHAINS[self.chain]['coin_prefix']}:{address}"
+
+
+class ProtocolAdapter:
+    """
+    Base class for a protocol market-data adapter.
+
+    Subclasses declare the endpoints they need in ``endpoints``; the registry
+    fetches those concurrently with the shared snapshot data and then hands
+    both to ``build``, all within the adapter's ``deadline``. ``chains`` lists
+    the chains whose contracts and pools the adapter can read; a chain no
+    adapter supports gets no snapshot.
+    """
+
+    name: str = ""
+    deadline: float = 10.0
+    yield_projects: List[str] = []
+    chains: List[str] = [DEFAULT_CHAIN]
+
+    def endpoints(self) -> Dict[str, str]:
+        """
+        Return the URLs this adapter needs, keyed by a local name.
+        """
+        return {}
+
+    async def build(self, responses: Dict[str, Any], context: MarketContext) -> Dict[str, Any]:
+        """
+        Build this protocol's entry of ``MarketData.protocols``.
+
+        Args:
+            responses (Dict[str, Any]): JSON responses keyed like ``endpoints``.
+            context (MarketContext): Shared snapshot data.
+
+        Returns:
+            Dict[str, Any]: Protocol data, e.g. ``{"markets": {...}}``.
+        """
+        raise NotImplementedError
+
+
+PROVIDER_REGISTRY: Dict[str, ProtocolAdapter] = {}
+
+
+def register_adapter(adapter: ProtocolAdapter) -> ProtocolAdapter:
+    """
+    Register an adapter under its name, replacing any previous one.
+    """
+    PROVIDER_REGISTRY[adapter.name] = adapter
+    return adapter
+
+
+def get_adapters(names: Optional[List[str]] = None, chain: Optional[str] = None) -> List[ProtocolAdapter]:
+    """
+    Return registered adapters, optionally only the named ones and those supporting ``chain``.
+    """
+    adapters = list(PROVIDER_REGISTRY.values()) if names is None else [
+        PROVIDER_REGISTRY[name] for name in names if name in PROVIDER_REGISTRY
+    ]
+    return [adapter for adapter in adapters if chain is None or chain in adapter.chains]
+
+
+async def _run_adapter(adapter: ProtocolAdapter, context: Awaitable[MarketContext]) -> Dict[str, Any]:
+    endpoints = adapter.endpoints()
+    results = await asyncio.gather(*(fetch_with_retry(url) for url in endpoints.values()))
+    return await adapter.build(dict(zip(endpoints, results)), await context)
+
+
+async def collect_protocols(
+    adapters: List[ProtocolAdapter], context: "asyncio.Future[MarketContext]"
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run adapters concurrently, each bounded by its own deadline.
+
+    A provider that fails or misses its deadline is logged and left out, so
+    the snapshot degrades to the protocols that did answer.
+
+    Args:
+        adapters (List[ProtocolAdapter]): Adapters to run.
+        context (asyncio.Future[MarketContext]): Shared snapshot data, possibly still loading.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Protocol data keyed by adapter name.
+    """
+    async def run(adapter: ProtocolAdapter) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(
+                _run_adapter(adapter, asyncio.shield(context)), timeout=adapter.deadline
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Provider '{adapter.name}' missed its {adapter.deadline}s deadline")
+        except Exception as e:
+            logger.error(f"Provider '{adapter.name}' failed: {e}")
+        return None
+
+    results = await asyncio.gather(*(run(adapter) for adapter in adapters))
+    return {
+        adapter.name: result
+        for adapter, result in zip(adapters, results)
+        if result is not None
+    }
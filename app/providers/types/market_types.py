@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from dataclasses import dataclass
 from app.providers.types.common import RiskMetrics, Token
 
@@ -23,9 +23,10 @@ class Vault:
 class MarketData:
     timestamp: int
     blockNumber: int
-    protocols: Dict[str, Dict[str, Dict[str, Market]]]
+    protocols: Dict[str, Dict[str, Dict[str, Union[Market, "Vault"]]]]
     tokens: Dict[str, "Token"]
     riskMetrics: Dict[str, "RiskMetrics"]
+    chain: str = "base"
 
 @dataclass
 class CoinsResponse:
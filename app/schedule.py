@@ -2,15 +2,39 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import asyncio
 
 from jobs.market_job import MarketDataJob
+from app.services.vector_service import VectorService
+from app.utils.api_client import close_http_client
+from app.evm.head_tracker import head_tracker
 
 
+async def run_market_job():
+    try:
+        await MarketDataJob.fetch_and_save_market_data()
+    finally:
+        await VectorService.flush()
+        await close_http_client()
+
 
 def schduler():
     scheduler = AsyncIOScheduler()
     scheduler.add_job(
-        func=lambda: asyncio.run(MarketDataJob.fetch_and_save_market_data()),
+        func=lambda: asyncio.run(run_market_job()),
         trigger="interval",
         hours=24 
     )
     scheduler.start()
-    print("Market job scheduled to run every 24 hours.")
\ No newline at end of file
+    print("Market job scheduled to run every 24 hours.")
+
+
+def schedule_every_n_blocks(blocks: int):
+    """
+    Refresh market data every ``blocks`` blocks, driven by the shared head tracker.
+
+    Must be called from a running event loop.
+    """
+    async def on_head(head):
+        await MarketDataJob.fetch_and_save_market_data()
+
+    head_tracker.on_blocks(blocks, on_head)
+    head_tracker.start()
+    print(f"Market job scheduled to run every {blocks} blocks.")
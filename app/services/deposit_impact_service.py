@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+from app.config.chains_config import DEFAULT_CHAIN
+from app.evm.client import get_web3_client
+from app.evm.head_tracker import get_head_tracker
+from app.evm.moonwell_reader import (
+    SECONDS_PER_YEAR,
+    JumpRateModel,
+    MoonwellMarketState,
+    read_moonwell_markets,
+    read_rate_models,
+)
+from app.types.strategy import ACTION_TYPES
+
+
+logger = logging.getLogger("DEPOSIT_IMPACT_SERVICE")
+logging.basicConfig(level=logging.INFO)
+
+AMOUNT_RATIO_SCALE = 10000
+
+
+@dataclass
+class DepositImpact:
+    """
+    Post-trade state of one market over a grid of deposit sizes and amount ratios.
+
+    Every array has shape ``(len(deposits), len(ratios))``. Cells where the
+    trade is not possible (borrowing or withdrawing more than the available
+    cash) are NaN.
+    """
+    underlying: str
+    symbol: str
+    action: str
+    deposits: np.ndarray
+    ratios: np.ndarray
+    amounts: np.ndarray
+    utilization: np.ndarray
+    supplyApy: np.ndarray
+    borrowApy: np.ndarray
+    currentSupplyApy: float
+    currentBorrowApy: float
+
+
+def _per_second_to_apy(rate: np.ndarray) -> np.ndarray:
+    return np.expm1(SECONDS_PER_YEAR * np.log1p(rate)) * 100
+
+
+class DepositImpactService:
+    """
+    Service simulating how our own trade size moves Moonwell utilization and APY.
+
+    Each market's jump-rate curve is rebuilt from its on-chain parameters and
+    evaluated for every market, deposit size and ``amountRatio`` at once with
+    NumPy broadcasting.
+    """
+
+    @staticmethod
+    def rates(
+        models: Sequence[JumpRateModel],
+        reserve_factors: np.ndarray,
+        cash: np.ndarray,
+        borrows: np.ndarray,
+        reserves: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Evaluate per-second borrow and supply rates of jump-rate models.
+
+        Model parameters and ``reserve_factors`` are per market (first axis);
+        balances broadcast against them.
+
+        Returns:
+            Dict[str, np.ndarray]: ``utilization``, ``borrowRate`` and ``supplyRate``.
+        """
+        shape = (len(models),) + (1,) * (np.ndim(cash) - 1)
+
+        def column(name: str) -> np.ndarray:
+            return np.array([getattr(model, name) for model in models], dtype=np.float64).reshape(shape)
+
+        base, multiplier, jump, kink = (column(name) for name in ("baseRate", "multiplier", "jumpMultiplier", "kink"))
+        reserve_factors = np.asarray(reserve_factors, dtype=np.float64).reshape(shape)
+
+        total = cash + borrows - reserves
+        utilization = np.divide(borrows, total, out=np.zeros(np.broadcast(borrows, total).shape), where=total > 0)
+        normal = np.minimum(utilization, kink) * multiplier + base
+        borrow_rate = normal + np.maximum(utilization - kink, 0) * jump
+        supply_rate = utilization * borrow_rate * (1 - reserve_factors)
+        return {"utilization": utilization, "borrowRate": borrow_rate, "supplyRate": supply_rate}
+
+    @staticmethod
+    def simulate(
+        states: Sequence[MoonwellMarketState],
+        models: Dict[str, JumpRateModel],
+        deposits: Iterable[float],
+        ratios: Iterable[int] = (2500, 5000, 7500, 10000),
+        action: str = "SUPPLY",
+    ) -> Dict[str, DepositImpact]:
+        """
+        Simulate post-trade APYs over a grid of deposit sizes and amount ratios.
+
+        The traded amount is ``deposit * amountRatio / 10000`` in underlying
+        units, applied as a strategy step would: SUPPLY adds cash, WITHDRAW
+        removes it, BORROW moves cash into borrows and REPAY moves it back.
+
+        Args:
+            states (Sequence[MoonwellMarketState]): Current market states.
+            models (Dict[str, JumpRateModel]): Rate models keyed by address.
+            deposits (Iterable[float]): Deposit sizes in underlying units.
+            ratios (Iterable[int]): ``amountRatio`` values in basis points.
+            action (str): One of ``ACTION_TYPES``. Defaults to "SUPPLY".
+
+        Returns:
+            Dict[str, DepositImpact]: Results keyed by underlying address; markets without a model are skipped.
+        """
+        if action not in ACTION_TYPES:
+            raise ValueError(f"Unknown action {action}. Expected one of {list(ACTION_TYPES)}")
+        states = [state for state in states if state.interestRateModel in models]
+        deposits = np.asarray(list(deposits), dtype=np.float64)
+        ratios = np.asarray(list(ratios), dtype=np.int64)
+        if not states:
+            return {}
+
+        def column(name: str) -> np.ndarray:
+            return np.array([getattr(state, name) for state in states], dtype=np.float64)[:, None, None]
+
+        cash, borrows, reserves = column("cash"), column("totalBorrows"), column("totalReserves")
+        rate_models = [models[state.interestRateModel] for state in states]
+        reserve_factors = column("reserveFactor")
+        current = DepositImpactService.rates(rate_models, reserve_factors, cash, borrows, reserves)
+
+        amounts = deposits[:, None] * ratios[None, :] / AMOUNT_RATIO_SCALE
+        amounts = np.broadcast_to(amounts, (len(states),) + amounts.shape)
+        if action == "SUPPLY":
+            cash, valid = cash + amounts, np.ones(amounts.shape, dtype=bool)
+        elif action == "WITHDRAW":
+            cash, valid = cash - amounts, amounts <= cash
+        elif action == "BORROW":
+            valid = amounts <= cash
+            cash, borrows = cash - amounts, borrows + amounts
+        else:
+            repaid = np.minimum(amounts, borrows)
+            cash, borrows, valid = cash + repaid, borrows - repaid, np.ones(amounts.shape, dtype=bool)
+
+        after = DepositImpactService.rates(rate_models, reserve_factors, cash, borrows, reserves)
+        supply_apy = np.where(valid, _per_second_to_apy(after["supplyRate"]), np.nan)
+        borrow_apy = np.where(valid, _per_second_to_apy(after["borrowRate"]), np.nan)
+        utilization = np.where(valid, after["utilization"], np.nan)
+        current_supply = _per_second_to_apy(current["supplyRate"]).ravel()
+        current_borrow = _per_second_to_apy(current["borrowRate"]).ravel()
+
+        return {
+            state.underlying: DepositImpact(
+                underlying=state.underlying,
+                symbol=state.symbol,
+                action=action,
+                deposits=deposits,
+                ratios=ratios,
+                amounts=np.array(amounts[i]),
+                utilization=utilization[i],
+                supplyApy=supply_apy[i],
+                borrowApy=borrow_apy[i],
+                currentSupplyApy=float(current_supply[i]),
+                currentBorrowApy=float(current_borrow[i]),
+            )
+            for i, state in enumerate(states)
+        }
+
+    @staticmethod
+    async def simulate_onchain(
+        deposits: Iterable[float],
+        ratios: Iterable[int] = (2500, 5000, 7500, 10000),
+        action: str = "SUPPLY",
+        block_identifier: Optional[int] = None,
+        chain: str = DEFAULT_CHAIN,
+    ) -> Dict[str, DepositImpact]:
+        """
+        Read current Moonwell markets and their rate models, then run ``simulate``.
+
+        Both reads are pinned to the same block, the chain's tracked head by default.
+        """
+        w3 = await asyncio.to_thread(get_web3_client, chain)
+        if block_identifier is None:
+            block_identifier = (await get_head_tracker(chain).latest()).number
+        states = await read_moonwell_markets(w3, block_identifier, chain=chain)
+        models = await read_rate_models(
+            w3, [state.interestRateModel for state in states.values()], block_identifier
+        )
+        return DepositImpactService.simulate(list(states.values()), models, deposits, ratios, action)
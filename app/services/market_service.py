@@ -1,14 +1,41 @@
-import json
+import asyncio
 import logging
-from typing import Dict
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from app.config.chains_config import DEFAULT_CHAIN
+from app.config.storage_config import STORAGE_CONFIG
 from app.services.vector_service import VectorService
 from app.providers.defi_llama_provider import get_market_data
 from app.providers.types.market_types import MarketData
+from app.utils.record_index import get_record_index
+from app.utils.snapshot_store import SnapshotStore
 
 
 logger = logging.getLogger("MARKET_SERVICE")
 logging.basicConfig(level=logging.INFO)
 
+_snapshot_stores: Dict[str, SnapshotStore] = {}
+
+
+def get_snapshot_store(chain: str = DEFAULT_CHAIN) -> SnapshotStore:
+    """
+    Return the market snapshot store of a chain.
+    """
+    if chain not in _snapshot_stores:
+        _snapshot_stores[chain] = SnapshotStore(
+            os.path.join(STORAGE_CONFIG["data_dir"], "market_snapshots", chain),
+            keyframe_interval=STORAGE_CONFIG["snapshot_keyframe_interval"],
+        )
+    return _snapshot_stores[chain]
+
+
+def _to_unix(timestamp: str) -> int:
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
 class MarketService:
     """
     Service for managing market data fetching, storage, and retrieval.
@@ -38,15 +65,37 @@ class MarketService:
         return market_data
 
     @staticmethod
-    async def fetch_market_data() -> Dict:
+    async def fetch_all_market_data(chains: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Fetches market data for several chains, one concurrent shard per chain.
+
+        Args:
+            chains (Optional[List[str]]): Chain keys. Defaults to the enabled chains.
+
+        Returns:
+            List[Dict]: Validated market data of every chain that succeeded.
+        """
+        try:
+            from dataclasses import asdict
+            snapshots = await get_market_data(chains)
+            return [await MarketService.validate_market_data(asdict(data)) for data in snapshots]
+        except Exception as e:
+            logger.error(f"Error fetching market data: {e}")
+            return []
+
+    @staticmethod
+    async def fetch_market_data(chain: str = DEFAULT_CHAIN) -> Dict:
         """
         Fetches market data from the provider asynchronously.
 
+        Args:
+            chain (str): Chain key. Defaults to "base".
+
         Returns:
             Dict: The fetched market data as a dictionary.
         """
         try:
-            data = await get_market_data()
+            data = await get_market_data([chain])
 
             if isinstance(data, list):
                 data = data[0] if data else {}
@@ -63,7 +112,13 @@ class MarketService:
     @staticmethod
     async def save_market_data(market_data: Dict) -> None:
         """
-        Saves market data to Pinecone.
+        Saves market data to the local snapshot store and indexes it in Pinecone.
+
+        The snapshot itself is stored as a delta against the previous one (or a
+        periodic keyframe); Pinecone only keeps the searchable description and
+        the timestamp needed to rebuild it. That entry goes through the vector
+        write-behind buffer, so shards saved together are indexed in one bulk
+        write on ``VectorService.flush()``.
 
         Args:
             market_data (Dict): The raw market data to save.
@@ -75,38 +130,90 @@ class MarketService:
             if "timestamp" not in market_data:
                 raise ValueError("Market data is missing the 'timestamp' key.")
 
-            key = f"market_data_{market_data['timestamp'][:19].replace('-', '_').replace(':', '_')}"
-            text = f"Market data snapshot generated at {market_data['timestamp']}."
+            chain = market_data.get("chain", DEFAULT_CHAIN)
+            snapshot_time = _to_unix(market_data["timestamp"])
+            kind = await asyncio.to_thread(get_snapshot_store(chain).write, snapshot_time, market_data)
+
+            key = f"market_data_{chain}_{market_data['timestamp'][:19].replace('-', '_').replace(':', '_')}"
+            text = f"Market data snapshot for {chain} generated at {market_data['timestamp']}."
 
             metadata = {
                 "type": "market_data",
+                "chain": chain,
                 "timestamp": market_data["timestamp"],
+                "snapshot_time": snapshot_time,
                 "description": "Market data snapshot for protocols.",
-                "data": json.dumps(market_data)
             }
 
-            await VectorService.save(key=key, metadata=metadata, text=text)
-            logger.info(f"Market data saved successfully with key: {key}")
+            await asyncio.to_thread(get_record_index(f"market_data:{chain}").add, key, snapshot_time, metadata)
+            await VectorService.buffered_save(key=key, metadata=metadata, text=text)
+            logger.info(f"Market data saved successfully with key: {key} ({kind})")
         except Exception as e:
-            logger.error(f"Error saving market data to Pinecone: {e}")
+            logger.error(f"Error saving market data: {e}")
             raise
 
     @staticmethod
-    async def get_latest_market_data() -> Dict:
+    async def get_market_data_at(timestamp: Optional[int] = None, chain: str = DEFAULT_CHAIN) -> Dict:
         """
-        Retrieves the latest market data from Pinecone.
+        Rebuilds the market data snapshot in effect at a given time.
+
+        Args:
+            timestamp (Optional[int]): Unix time. Defaults to the latest snapshot.
+            chain (str): Chain key. Defaults to "base".
+
+        Returns:
+            Dict: The market data, or an empty dict if none was stored by then.
+        """
+        result = await asyncio.to_thread(get_snapshot_store(chain).read, timestamp)
+        return result[1] if result else {}
+
+    @staticmethod
+    async def get_recent_market_data(limit: int = 10, chain: str = DEFAULT_CHAIN) -> List[Dict]:
+        """
+        Rebuilds the most recent market data snapshots.
+
+        Args:
+            limit (int): Maximum number of snapshots. Defaults to 10.
+            chain (str): Chain key. Defaults to "base".
+
+        Returns:
+            List[Dict]: Market data, newest first.
+        """
+        records = await asyncio.to_thread(get_record_index(f"market_data:{chain}").latest_n, limit)
+        return [await MarketService.get_market_data_at(record["snapshot_time"], chain) for record in records]
+
+    @staticmethod
+    async def get_market_data_between(
+        start: Optional[int] = None, end: Optional[int] = None, chain: str = DEFAULT_CHAIN
+    ) -> List[Dict]:
+        """
+        Rebuilds the market data snapshots taken in a time range.
+
+        Args:
+            start (Optional[int]): Unix time lower bound. Unbounded if None.
+            end (Optional[int]): Unix time upper bound. Unbounded if None.
+            chain (str): Chain key. Defaults to "base".
+
+        Returns:
+            List[Dict]: Market data, oldest first.
+        """
+        records = await asyncio.to_thread(get_record_index(f"market_data:{chain}").between, start, end)
+        return [await MarketService.get_market_data_at(record["snapshot_time"], chain) for record in records]
+
+    @staticmethod
+    async def get_latest_market_data(chain: str = DEFAULT_CHAIN) -> Dict:
+        """
+        Retrieves the latest market data from the snapshot store, which keeps
+        the newest snapshot in memory; no vector search is involved.
+
+        Args:
+            chain (str): Chain key. Defaults to "base".
 
         Returns:
             Dict: The most recent market data.
         """
         try:
-            results = await VectorService.natural_query("Latest market data", limit=1, min_score=0.5)
-            logger.info(f"Natural query results: {results}")
-
-            if results:
-                return results[0]["metadata"]["data"]
-            return {}
+            return await MarketService.get_market_data_at(chain=chain)
         except Exception as e:
             logger.error(f"Error fetching market data: {e}")
             return {}
-
@@ -1,8 +1,10 @@
+import asyncio
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Optional
 from app.services.vector_service import VectorService
+from app.utils.record_index import get_record_index
 
 
 logger = logging.getLogger("PERFORMANCE_SERVICE")
@@ -12,6 +14,19 @@ class PerformanceService:
     """
     Service to manage strategies: saving, updating performance, fetching, and querying.
     """
+    @staticmethod
+    async def save_performance_data(data: Dict) -> None:
+        """
+        Record a performance data point in the timestamp-ordered performance index.
+
+        Args:
+            data (Dict): Performance data, e.g. a strategy's updated metrics.
+        """
+        now = datetime.now(timezone.utc)
+        key = f"performance_{now.strftime('%Y_%m_%d_%H_%M_%S_%f')}"
+        record = {"recorded_at": now.isoformat(), "data": data}
+        await asyncio.to_thread(get_record_index("performance").add, key, int(now.timestamp()), record)
+
     @staticmethod
     async def get_latest_performance_data() -> Dict:
         """
@@ -21,20 +36,38 @@ class PerformanceService:
             Dict: The most recent performance data.
         """
         try:
-            results = await VectorService.natural_query("Latest performance data", limit=1,min_score=0.5)
-            logger.info(f"Natural query results: {results}")
-
-            if results:
-                return results[0]["metadata"]["data"]
-            return {}
+            record = await asyncio.to_thread(get_record_index("performance").latest)
+            return record["data"] if record else {}
         except Exception as e:
             logger.error(f"Error fetching performance data: {e}")
             return {}
+
+    @staticmethod
+    async def get_performance_history(
+        limit: Optional[int] = None, start: Optional[int] = None, end: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Fetch recorded performance data, either the latest ``limit`` points or a time range.
+
+        Args:
+            limit (Optional[int]): Number of most recent points, newest first.
+            start (Optional[int]): Unix time lower bound for a range read, oldest first.
+            end (Optional[int]): Unix time upper bound for a range read.
+
+        Returns:
+            List[Dict]: Performance data points.
+        """
+        index = get_record_index("performance")
+        if limit is not None:
+            records = await asyncio.to_thread(index.latest_n, limit)
+        else:
+            records = await asyncio.to_thread(index.between, start, end)
+        return [record["data"] for record in records]
     
     @staticmethod
     async def save_strategy(strategy: Dict) -> None:
         """
-        Save a generated strategy into Pinecone.
+        Save a generated strategy into Pinecone through the vector write-behind buffer.
 
         Args:
             strategy (Dict): The strategy object to save. Must contain 'name', 'description', and other metadata.
@@ -77,7 +110,7 @@ class PerformanceService:
             Full Strategy: {json.dumps(strategy_text, indent=2)}
             """
 
-            await VectorService.save(
+            await VectorService.buffered_save(
                 key=strategy_id,
                 metadata=metadata,
                 text=searchable_text
@@ -99,7 +132,7 @@ class PerformanceService:
         try:
             logger.info(f"Updating strategy performance for ID: {strategy_id}")
 
-            strategy = VectorService.fetch(strategy_id)
+            strategy = await VectorService.fetch(strategy_id)
             if not strategy:
                 logger.warning(f"No strategy found with ID: {strategy_id}")
                 return
@@ -112,7 +145,8 @@ class PerformanceService:
                 **update_data
             })
 
-            VectorService.save(key=strategy_id, metadata=metadata, text=metadata["description"])
+            await VectorService.buffered_save(key=strategy_id, metadata=metadata, text=metadata["description"])
+            await PerformanceService.save_performance_data({"strategy_id": strategy_id, "name": metadata.get("name"), **update_data})
             logger.info(f"Strategy performance updated successfully for ID: {strategy_id}")
 
         except Exception as e:
@@ -132,7 +166,7 @@ class PerformanceService:
         try:
             logger.info(f"Fetching strategy with ID: {strategy_id}")
 
-            strategy = VectorService.fetch(strategy_id)
+            strategy = await VectorService.fetch(strategy_id)
             if strategy:
                 logger.info(f"Fetched strategy: {strategy_id}")
                 return strategy
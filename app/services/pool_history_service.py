@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.config.chains_config import DEFAULT_CHAIN
+from app.config.storage_config import STORAGE_CONFIG
+from app.providers.defi_llama_provider import fetch_pool_chart
+from app.providers.pool_universe import get_pool_universe
+from app.providers.registry import get_adapters
+from app.utils.timeseries import TimeSeriesStore
+
+
+logger = logging.getLogger("POOL_HISTORY_SERVICE")
+logging.basicConfig(level=logging.INFO)
+
+POOL_HISTORY_FIELDS = ("apy", "apyBase", "apyReward", "tvlUsd")
+pool_history_store = TimeSeriesStore(
+    os.path.join(STORAGE_CONFIG["data_dir"], "pool_history"), POOL_HISTORY_FIELDS
+)
+
+
+class PoolHistoryService:
+    """
+    Service keeping a local APY/TVL history per yield pool.
+
+    New pools are seeded once from DeFi Llama's ``/chart/{pool}`` endpoint;
+    afterwards every ingest only appends the current point taken from the
+    chain's pool universe, which the market snapshot already filled from
+    ``/pools``, so trend analysis never re-downloads history.
+    """
+
+    @staticmethod
+    async def backfill_pool(pool_id: str) -> int:
+        """
+        Seed a pool's history from its DeFi Llama chart.
+
+        Args:
+            pool_id (str): DeFi Llama pool identifier.
+
+        Returns:
+            int: Number of points written.
+        """
+        points = await fetch_pool_chart(pool_id)
+        written = await asyncio.to_thread(pool_history_store.append_rows, pool_id, points)
+        logger.info(f"Backfilled {written} points for pool {pool_id}")
+        return written
+
+    @staticmethod
+    async def ingest_pools(
+        pools: Iterable[Dict[str, Any]], timestamp: Optional[int] = None, max_concurrency: int = 5
+    ) -> Dict[str, int]:
+        """
+        Append the current APY/TVL of each pool, seeding unseen pools from their chart first.
+
+        Args:
+            pools (Iterable[Dict[str, Any]]): Raw ``/pools`` entries.
+            timestamp (Optional[int]): Unix time of the snapshot. Defaults to now.
+            max_concurrency (int): Maximum concurrent chart downloads. Defaults to 5.
+
+        Returns:
+            Dict[str, int]: Number of pools backfilled and points appended.
+        """
+        timestamp = int(timestamp or time.time())
+        pools = [pool for pool in pools if pool.get("pool")]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def seed(pool_id: str) -> None:
+            async with semaphore:
+                try:
+                    await PoolHistoryService.backfill_pool(pool_id)
+                except Exception as e:
+                    logger.error(f"Error backfilling pool {pool_id}: {e}")
+
+        new_pools = [pool["pool"] for pool in pools if pool_history_store.count(pool["pool"]) == 0]
+        await asyncio.gather(*(seed(pool_id) for pool_id in new_pools))
+
+        appended = 0
+        for pool in pools:
+            row = {"timestamp": timestamp, **{name: pool.get(name) for name in POOL_HISTORY_FIELDS}}
+            appended += pool_history_store.append_rows(pool["pool"], [row])
+
+        logger.info(f"Pool history ingest: {len(new_pools)} pools backfilled, {appended} points appended")
+        return {"backfilled": len(new_pools), "appended": appended}
+
+    @staticmethod
+    async def sync_pool_history(chain: str = DEFAULT_CHAIN, projects: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Ingest the chain's pool universe, as of its last update, into the history store.
+
+        No request is made for the pools themselves; run this after the market
+        snapshot has refreshed the universe. Points are stamped with the time
+        of that refresh, so a universe kept from an earlier run adds nothing.
+
+        Args:
+            chain (str): Key of ``CHAINS``. Defaults to "base".
+            projects (Optional[Iterable[str]]): Project slugs to track. Defaults to the
+                yield projects of every adapter supporting the chain.
+
+        Returns:
+            Dict[str, int]: Ingest counters from ``ingest_pools``.
+        """
+        universe = get_pool_universe(chain)
+        if universe.updated_at is None:
+            logger.warning(f"Pool universe for {chain} not loaded yet; skipping pool history sync")
+            return {"backfilled": 0, "appended": 0}
+        if projects is None:
+            projects = {project for adapter in get_adapters(chain=chain) for project in adapter.yield_projects}
+        pools = [pool for project in sorted(set(projects)) for pool in universe.pools_for_project(project)]
+        return await PoolHistoryService.ingest_pools(pools, timestamp=universe.updated_at)
+
+    @staticmethod
+    def get_history(pool_id: str, start: Optional[int] = None, end: Optional[int] = None) -> List[Dict[str, float]]:
+        """
+        Return the stored history of a pool within a time window.
+
+        Args:
+            pool_id (str): DeFi Llama pool identifier.
+            start (Optional[int]): Inclusive start (unix seconds).
+            end (Optional[int]): Inclusive end (unix seconds).
+
+        Returns:
+            List[Dict[str, float]]: Points ordered by timestamp.
+        """
+        records = pool_history_store.range(pool_id, start, end)
+        return [dict(zip(records.dtype.names, record.tolist())) for record in records]
@@ -0,0 +1,112 @@
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.config.storage_config import STORAGE_CONFIG
+from app.utils.timeseries import TimeSeriesStore
+
+
+logger = logging.getLogger("PRICE_HISTORY_SERVICE")
+logging.basicConfig(level=logging.INFO)
+
+PRICE_CHANGE_PERIODS = {
+    "24h": 24 * 60 * 60,
+    "7d": 7 * 24 * 60 * 60,
+    "30d": 30 * 24 * 60 * 60,
+}
+price_history_store = TimeSeriesStore(
+    os.path.join(STORAGE_CONFIG["data_dir"], "price_history"), ("price",)
+)
+
+
+class PriceHistoryService:
+    """
+    Service keeping a local price history per coin and deriving price changes from it.
+
+    Series are keyed by DeFi Llama coin id (e.g. ``base:0x...``).
+    """
+
+    @staticmethod
+    def record_prices(coins: Dict[str, Dict], timestamp: Optional[int] = None) -> int:
+        """
+        Append the prices of a ``/prices/current`` response.
+
+        Args:
+            coins (Dict[str, Dict]): The response's ``coins`` mapping.
+            timestamp (Optional[int]): Fallback unix time for coins without one. Defaults to now.
+
+        Returns:
+            int: Number of points written.
+        """
+        timestamp = int(timestamp or time.time())
+        written = 0
+        for coin_id, data in coins.items():
+            if data.get("price") is None:
+                continue
+            row = {"timestamp": int(data.get("timestamp") or timestamp), "price": data["price"]}
+            written += price_history_store.append_rows(coin_id, [row])
+        return written
+
+    @staticmethod
+    def compute_changes(
+        coin_ids: Iterable[str],
+        periods: Iterable[str] = PRICE_CHANGE_PERIODS,
+        now: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Compute percentage price changes from stored history.
+
+        For each coin, the latest stored price is compared with the stored
+        price closest to ``now - period``; lookups for all periods are one
+        vectorized binary search. A period is None when no stored point lies
+        within the configured tolerance of its lookback time.
+
+        Args:
+            coin_ids (Iterable[str]): DeFi Llama coin ids.
+            periods (Iterable[str]): Keys of ``PRICE_CHANGE_PERIODS``.
+            now (Optional[int]): Reference unix time. Defaults to now.
+
+        Returns:
+            Dict[str, Dict[str, Optional[float]]]: Percentage change per coin and period.
+        """
+        now = int(now or time.time())
+        periods = list(periods)
+        offsets = np.array([PRICE_CHANGE_PERIODS[p] for p in periods], dtype=np.int64)
+        tolerance = offsets * STORAGE_CONFIG["price_history_tolerance"]
+        oldest = now - int(offsets.max() + tolerance.max()) if len(offsets) else now
+
+        changes: Dict[str, Dict[str, Optional[float]]] = {}
+        for coin_id in coin_ids:
+            records = price_history_store.range(coin_id, oldest, now)
+            result: Dict[str, Optional[float]] = dict.fromkeys(periods)
+            if len(records):
+                timestamps, prices = records["timestamp"], records["price"]
+                targets = now - offsets
+                # Nearest stored point to each lookback time, excluding the latest one.
+                last = len(timestamps) - 1
+                right = np.minimum(np.searchsorted(timestamps, targets, side="left"), max(last - 1, 0))
+                left = np.maximum(right - 1, 0)
+                idx = np.where(
+                    np.abs(timestamps[left] - targets) <= np.abs(timestamps[right] - targets), left, right
+                )
+                valid = (last > 0) & (np.abs(targets - timestamps[idx]) <= tolerance)
+                past = prices[idx]
+                valid &= past > 0
+                pct = np.where(valid, (prices[-1] / np.where(past > 0, past, 1) - 1) * 100, np.nan)
+                result = {
+                    period: (None if np.isnan(value) else float(value))
+                    for period, value in zip(periods, pct.tolist())
+                }
+            changes[coin_id] = result
+        return changes
+
+    @staticmethod
+    def get_history(coin_id: str, start: Optional[int] = None, end: Optional[int] = None) -> List[Dict[str, float]]:
+        """
+        Return the stored prices of a coin within a time window.
+        """
+        records = price_history_store.range(coin_id, start, end)
+        return [dict(zip(records.dtype.names, record.tolist())) for record in records]
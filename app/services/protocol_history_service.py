@@ -0,0 +1,36 @@
+import logging
+import os
+from typing import Dict, List, Optional
+
+from app.config.storage_config import STORAGE_CONFIG
+from app.utils.timeseries import TimeSeriesStore
+
+
+logger = logging.getLogger("PROTOCOL_HISTORY_SERVICE")
+logging.basicConfig(level=logging.INFO)
+
+protocol_tvl_store = TimeSeriesStore(
+    os.path.join(STORAGE_CONFIG["data_dir"], "protocol_tvl"), ("tvlUsd",)
+)
+
+
+class ProtocolHistoryService:
+    """
+    Service keeping a local daily TVL history per protocol and chain.
+
+    Series are keyed as ``{chain}:{slug}`` (e.g. ``Base:moonwell``).
+    """
+
+    @staticmethod
+    def series_id(slug: str, chain: str = "Base") -> str:
+        return f"{chain}:{slug}"
+
+    @staticmethod
+    def get_history(
+        slug: str, chain: str = "Base", start: Optional[int] = None, end: Optional[int] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Return the stored TVL of a protocol within a time window.
+        """
+        records = protocol_tvl_store.range(ProtocolHistoryService.series_id(slug, chain), start, end)
+        return [dict(zip(records.dtype.names, record.tolist())) for record in records]
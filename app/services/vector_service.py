@@ -1,16 +1,20 @@
+import asyncio
 import os
 import logging
-from typing import Dict, List, Optional, Any
-from pinecone import Pinecone, ServerlessSpec
-from langchain_openai import OpenAIEmbeddings
-from langchain_pinecone import PineconeVectorStore
+from typing import Dict, Iterable, List, Optional, Any
 from dotenv import load_dotenv
+from app.config.vector_config import VECTOR_INDEX_CONFIG, VECTOR_WRITE_CONFIG
+from app.utils.embedding_cache import CachedEmbeddings, embedding_disk_cache, get_embedding_stats
+from app.utils.retry import retry
+from app.utils.write_buffer import WriteBuffer
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+EMBEDDING_MODEL = "text-embedding-ada-002"
+
 class VectorStoreService:
     _instance = None
 
@@ -21,13 +25,35 @@ class VectorStoreService:
 
     def __init__(self):
         if not hasattr(self, 'initialized'):
-            self._initialize_pinecone()
+            self.backend = VECTOR_INDEX_CONFIG["backend"]
+            if self.backend == "local":
+                self._initialize_local_index()
+            elif self.backend == "pinecone":
+                self._initialize_pinecone()
+            else:
+                raise ValueError(f"Unknown vector backend: {self.backend}. Expected 'pinecone' or 'local'")
             self._initialize_embeddings()
             self._initialize_vector_store()
             self.initialized = True
 
+    def _initialize_local_index(self):
+        """Initialize the in-process vector index"""
+        from app.utils.vector_index import LocalVectorIndex
+
+        self.index = LocalVectorIndex(
+            VECTOR_INDEX_CONFIG["directory"],
+            dimension=VECTOR_INDEX_CONFIG["dimension"],
+            brute_force_max=VECTOR_INDEX_CONFIG["brute_force_max"],
+            graph_degree=VECTOR_INDEX_CONFIG["graph_degree"],
+            ef_construction=VECTOR_INDEX_CONFIG["ef_construction"],
+            ef_search=VECTOR_INDEX_CONFIG["ef_search"],
+        )
+        logger.info("Local vector index initialized with %d records at %s", len(self.index), VECTOR_INDEX_CONFIG["directory"])
+
     def _initialize_pinecone(self):
         """Initialize Pinecone client and index"""
+        from pinecone import Pinecone, ServerlessSpec
+
         self.pinecone_api_key = os.getenv("PINECONE_API_KEY", "")
         self.pinecone_environment = os.getenv("PINECONE_ENVIRONMENT", "")
         self.pinecone_index_name = os.getenv("PINECONE_INDEX_NAME", "")
@@ -46,7 +72,7 @@ class VectorStoreService:
                 logger.info("Creating Pinecone index: %s", self.pinecone_index_name)
                 self.pinecone_client.create_index(
                     name=self.pinecone_index_name,
-                    dimension=1536,
+                    dimension=VECTOR_INDEX_CONFIG["dimension"],
                     metric="cosine",
                     spec=ServerlessSpec(
                         cloud="aws",
@@ -62,16 +88,35 @@ class VectorStoreService:
     def _initialize_embeddings(self):
         """Initialize OpenAI embeddings"""
         try:
-            self.embedding_model = OpenAIEmbeddings(model="text-embedding-ada-002")
-            logger.info("OpenAI Embedding model initialized.")
+            if VECTOR_INDEX_CONFIG["embeddings"] == "fake":
+                from langchain_core.embeddings import DeterministicFakeEmbedding
+
+                embeddings = DeterministicFakeEmbedding(size=VECTOR_INDEX_CONFIG["dimension"])
+                model = "fake"
+            else:
+                from langchain_openai import OpenAIEmbeddings
+
+                embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL)
+                model = EMBEDDING_MODEL
+            self.embedding_model = CachedEmbeddings(
+                embeddings,
+                model=model,
+                disk_cache=embedding_disk_cache,
+            )
+            logger.info("Embedding model %s initialized with embedding cache.", model)
         except Exception as e:
             logger.error("Error initializing embedding model: %s", str(e))
             raise
 
     def _initialize_vector_store(self):
-        """Initialize Langchain PineconeVectorStore"""
+        """Initialize Langchain PineconeVectorStore, or its local stand-in"""
         try:
-            self.vector_store = PineconeVectorStore(
+            if self.backend == "local":
+                from app.utils.vector_index import LocalVectorStore as VectorStore
+            else:
+                from langchain_pinecone import PineconeVectorStore as VectorStore
+
+            self.vector_store = VectorStore(
                 embedding=self.embedding_model,
                 index=self.index,
                 text_key="text"
@@ -81,6 +126,7 @@ class VectorStoreService:
             logger.error("Error initializing vector store: %s", str(e))
             raise
 
+    @retry(retries=3, delay=0.5, breaker="pinecone")
     async def save(self, key: str, metadata: Dict[str, Any], text: str) -> None:
         """
         Save data to vector store
@@ -102,41 +148,145 @@ class VectorStoreService:
             logger.error("Error saving data for key '%s': %s", key, str(e))
             raise
 
-    async def fetch(self, key: str) -> Optional[Dict[str, Any]]:
+    @retry(retries=3, delay=0.5, breaker="pinecone")
+    async def _save_batch(self, records: List[Dict[str, Any]]) -> None:
+        await self.vector_store.aadd_texts(
+            texts=[record["text"] for record in records],
+            metadatas=[{"id": record["key"], **record["metadata"]} for record in records],
+            ids=[record["key"] for record in records],
+            batch_size=VECTOR_WRITE_CONFIG["upsert_batch_size"],
+            embedding_chunk_size=VECTOR_WRITE_CONFIG["embed_batch_size"],
+        )
+
+    async def save_many(self, records: Iterable[Dict[str, Any]]) -> int:
         """
-        Fetch data by key
-        
+        Save many records with batched embedding and bulk upserts
+
+        Records are split into batches of ``embed_batch_size``; each batch is
+        embedded in one call and upserted in chunks of ``upsert_batch_size``,
+        with up to ``max_concurrent_batches`` batches in flight.
+
         Args:
-            key (str): Key to retrieve
-            
+            records (Iterable[Dict[str, Any]]): Records with "key", "metadata" and "text"
+
         Returns:
-            Optional[Dict[str, Any]]: Retrieved data or None if not found
+            int: Number of records saved
         """
+        records = list(records)
+        size = VECTOR_WRITE_CONFIG["embed_batch_size"]
+        batches = [records[i:i + size] for i in range(0, len(records), size)]
+        semaphore = asyncio.Semaphore(VECTOR_WRITE_CONFIG["max_concurrent_batches"])
+
+        async def run(batch: List[Dict[str, Any]]) -> None:
+            async with semaphore:
+                await self._save_batch(batch)
+
         try:
-            logger.info("Fetching data from vector store for key: %s", key)
-            results = await self.vector_store.asimilarity_search_with_score(
-                query="",
-                k=1,
-                filter={"id": key}
+            logger.info("Saving %d records to vector store in %d batches", len(records), len(batches))
+            await asyncio.gather(*(run(batch) for batch in batches))
+            return len(records)
+        except Exception as e:
+            logger.error("Error saving %d records: %s", len(records), str(e))
+            raise
+
+    async def buffered_save(self, key: str, metadata: Dict[str, Any], text: str) -> None:
+        """
+        Queue a record in the write-behind buffer instead of saving it right away
+
+        The buffer is written with ``save_many`` once it is full, on its flush
+        interval, and on ``flush``. A later record for the same key replaces a
+        pending one.
+
+        Args:
+            key (str): Unique identifier for the data
+            metadata (Dict[str, Any]): Additional metadata to store
+            text (str): Text content to embed and store
+        """
+        if getattr(self, "write_buffer", None) is None:
+            self.write_buffer = WriteBuffer(
+                self.save_many,
+                max_records=VECTOR_WRITE_CONFIG["buffer_max_records"],
+                flush_interval=VECTOR_WRITE_CONFIG["buffer_flush_interval"],
             )
-            
-            if not results:
-                logger.warning("No data found in vector store for key: %s", key)
-                return None
-                
-            doc, score = results[0]
+        await self.write_buffer.add(key, {"key": key, "metadata": metadata, "text": text})
+
+    async def flush(self) -> None:
+        """
+        Write out everything pending in the write-behind buffer; call on shutdown
+        """
+        if getattr(self, "write_buffer", None) is not None:
+            await self.write_buffer.close()
+
+    def _fetch_records(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Point-read records from the index backend, in batches of ``fetch_batch_size``"""
+        if self.backend == "local":
             return {
-                "document": doc.page_content,
-                "metadata": doc.metadata,
-                "score": score
+                key: {"document": record["text"], "metadata": record["metadata"]}
+                for key, record in self.index.fetch(keys).items()
             }
+        records = {}
+        size = VECTOR_INDEX_CONFIG["fetch_batch_size"]
+        for i in range(0, len(keys), size):
+            response = self.index.fetch(ids=keys[i:i + size])
+            for key, vector in response.vectors.items():
+                metadata = dict(vector.metadata or {})
+                records[key] = {"document": metadata.pop("text", ""), "metadata": metadata}
+        return records
+
+    @retry(retries=3, delay=0.5, breaker="pinecone")
+    async def fetch_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch many records by key with the index's native point lookup
+
+        No embedding or similarity search is involved. Records still pending in
+        the write-behind buffer are served from it, so reads see buffered writes.
+
+        Args:
+            keys (Iterable[str]): Keys to retrieve
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Records with "document" and "metadata", keyed by key; missing keys are left out
+        """
+        keys = list(dict.fromkeys(keys))
+        buffer = getattr(self, "write_buffer", None)
+        pending = {}
+        if buffer is not None:
+            for key in keys:
+                record = buffer.get(key)
+                if record is not None:
+                    pending[key] = {"document": record["text"], "metadata": {"id": key, **record["metadata"]}}
+        keys = [key for key in keys if key not in pending]
+        if not keys:
+            return pending
+        try:
+            logger.info("Fetching %d keys from vector store", len(keys))
+            return {**await asyncio.to_thread(self._fetch_records, keys), **pending}
         except Exception as e:
-            logger.error("Error fetching data for key '%s': %s", key, str(e))
+            logger.error("Error fetching %d keys: %s", len(keys), str(e))
             raise
 
+    async def fetch(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch data by key
+        
+        Args:
+            key (str): Key to retrieve
+            
+        Returns:
+            Optional[Dict[str, Any]]: Retrieved data or None if not found
+        """
+        records = await self.fetch_many([key])
+        if key not in records:
+            logger.warning("No data found in vector store for key: %s", key)
+            return None
+        return records[key]
+
     async def update(self, key: str, metadata: Dict[str, Any], text: str) -> None:
         """
         Update data in vector store
+
+        Saving under an existing key overwrites the record in place, so no
+        lookup or delete is needed first.
         
         Args:
             key (str): Key to update
@@ -145,18 +295,18 @@ class VectorStoreService:
         """
         try:
             logger.info("Updating data in vector store for key: %s", key)
-            existing_data = await self.fetch(key)
-            if not existing_data:
-                logger.warning("No existing data found for key: %s. Creating new entry.", key)
-            
-            await self.vector_store.adelete([key])
-            
             await self.save(key, metadata, text)
             logger.info("Data updated successfully for key: %s", key)
         except Exception as e:
             logger.error("Error updating data for key '%s': %s", key, str(e))
             raise
 
+    def embedding_stats(self) -> Dict[str, float]:
+        """
+        Return hit/miss counters and the hit rate of the embedding cache.
+        """
+        return get_embedding_stats(self.embedding_model)
+
     async def delete(self, key: str) -> bool:
         """
         Delete data from vector store
@@ -176,6 +326,7 @@ class VectorStoreService:
             logger.error("Error deleting data for key '%s': %s", key, str(e))
             return False
 
+    @retry(retries=3, delay=0.5, breaker="pinecone")
     async def natural_query(
         self, 
         query: str, 
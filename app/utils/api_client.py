@@ -1,5 +1,180 @@
+import asyncio
+import codecs
+import gzip
+import importlib.util
+import json
+import logging
+import os
+from dataclasses import dataclass, field, asdict
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
 import httpx
-from typing import Any, Dict, Optional
+
+from app.config.http_config import HTTP_CONFIG, RESILIENCE_CONFIG
+from app.utils.http_cache import http_cache
+from app.utils.json_stream import JsonArrayStreamParser
+from app.utils.rate_limiter import rate_limiter
+from app.utils.resilience import backoff_delay, get_breaker, parse_retry_after, retry_budget
+from app.utils.single_flight import SingleFlight, request_key
+
+logger = logging.getLogger("API_CLIENT")
+
+
+@dataclass
+class PoolStats:
+    clients_created: int = 0
+    requests: int = 0
+    active_requests: int = 0
+    peak_active_requests: int = 0
+    active_by_host: Dict[str, int] = field(default_factory=dict)
+    requests_by_host: Dict[str, int] = field(default_factory=dict)
+    http2_enabled: bool = False
+
+
+class HttpClientManager:
+    """
+    Owns the process-wide pooled ``httpx.AsyncClient`` used by all providers.
+
+    The client is created lazily on first use and bound to the event loop it
+    was created on; callers running on a different loop (e.g. jobs executed via
+    ``asyncio.run``) transparently get a fresh client for that loop.
+    """
+
+    def __init__(self, config: Dict[str, Any] = HTTP_CONFIG):
+        self.config = config
+        self.stats = PoolStats()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _http2_available(self) -> bool:
+        return bool(self.config.get("http2")) and importlib.util.find_spec("h2") is not None
+
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared client, creating it for the running loop if needed.
+
+        Returns:
+            httpx.AsyncClient: Pooled client with keep-alive enabled.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            http2 = self._http2_available()
+            self._client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=self.config["max_connections"],
+                    max_keepalive_connections=self.config["max_keepalive_connections"],
+                    keepalive_expiry=self.config["keepalive_expiry"],
+                ),
+            )
+            self._loop = loop
+            self._host_semaphores = {}
+            self.stats.clients_created += 1
+            self.stats.http2_enabled = http2
+            logger.info(f"Created pooled HTTP client (http2={http2})")
+        return self._client
+
+    def host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """
+        Return the semaphore capping concurrent connections to the URL's host.
+
+        Args:
+            url (str): Request URL.
+
+        Returns:
+            asyncio.Semaphore: Per-host concurrency limiter.
+        """
+        host = urlsplit(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.config["max_connections_per_host"])
+        return self._host_semaphores[host]
+
+    def track(self, url: str, delta: int) -> None:
+        host = urlsplit(url).netloc
+        stats = self.stats
+        stats.active_requests += delta
+        stats.active_by_host[host] = stats.active_by_host.get(host, 0) + delta
+        if delta > 0:
+            stats.requests += 1
+            stats.requests_by_host[host] = stats.requests_by_host.get(host, 0) + 1
+            stats.peak_active_requests = max(stats.peak_active_requests, stats.active_requests)
+
+    async def close(self) -> None:
+        """
+        Close the shared client and release its pooled connections.
+        """
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Closed pooled HTTP client")
+        self._client = None
+        self._loop = None
+        self._host_semaphores = {}
+
+
+http_client_manager = HttpClientManager()
+request_coalescer = SingleFlight()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared pooled HTTP client for the running event loop.
+
+    Returns:
+        httpx.AsyncClient: Shared client.
+    """
+    return http_client_manager.get_client()
+
+
+async def close_http_client() -> None:
+    """
+    Gracefully close the shared HTTP client. Call on application shutdown.
+    """
+    await http_client_manager.close()
+
+
+def accept_encoding() -> str:
+    """
+    Return the Accept-Encoding value for the compression codecs we can decode.
+
+    Returns:
+        str: Comma-separated list of content codings.
+    """
+    encodings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        encodings.append("br")
+    return ", ".join(encodings)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Return usage statistics for the shared HTTP client.
+
+    Returns:
+        Dict[str, Any]: Request counters, in-flight requests per host and client info.
+    """
+    return asdict(http_client_manager.stats)
+
+
+def get_coalescing_stats() -> Dict[str, int]:
+    """
+    Return how many fetch_with_retry calls were served by an identical in-flight request.
+
+    Returns:
+        Dict[str, int]: Total calls, actual executions and deduplicated calls.
+    """
+    return request_coalescer.get_stats()
+
+
+def _waits_too_long(retry_after: Optional[float]) -> bool:
+    """
+    Return whether a Retry-After asks for longer than ``backoff_cap``.
+
+    Such responses fail right away instead of parking the (possibly shared)
+    request for the whole wait.
+    """
+    return retry_after is not None and retry_after > RESILIENCE_CONFIG["backoff_cap"]
 
 
 async def fetch_with_retry(
@@ -9,10 +184,22 @@ async def fetch_with_retry(
     headers: Optional[Dict] = None,
     retries: int = 3,
     timeout: int = 10,
+    use_cache: bool = True,
 ) -> Any:
     """
     Fetch data from an API with optional retries.
 
+    Concurrent calls with the same method, URL, params and headers share a
+    single in-flight request and receive the same decoded JSON object, which
+    callers must therefore treat as read-only. GET requests go through the
+    on-disk HTTP cache: fresh entries are served without a request, stale ones
+    are revalidated with If-None-Match / If-Modified-Since and reused on
+    ``304 Not Modified``. Every attempt waits on the host's token bucket
+    (``RATE_LIMITS``) before it is sent. Connection errors and retryable statuses (429/5xx)
+    are retried with jittered exponential backoff, honouring Retry-After up
+    to ``backoff_cap`` (a longer Retry-After fails the call right away),
+    behind a per-host circuit breaker and the process-wide retry budget.
+
     Args:
         url (str): API URL to fetch data from.
         method (str): HTTP method (GET, POST, etc.). Defaults to "GET".
@@ -20,22 +207,288 @@ async def fetch_with_retry(
         headers (Optional[Dict]): HTTP headers. Defaults to None.
         retries (int): Number of retries for failed requests. Defaults to 3.
         timeout (int): Timeout for the request in seconds. Defaults to 10.
+        use_cache (bool): Whether to use the HTTP disk cache for GET requests. Defaults to True.
 
     Returns:
         Any: JSON response from the API.
 
     Raises:
         httpx.RequestError: If the request fails after all retries.
+        httpx.HTTPStatusError: If the response status is an error after all retries.
+        CircuitOpenError: If the host's circuit breaker is open.
     """
-    async with httpx.AsyncClient() as client:
-        for attempt in range(retries):
+    return await request_coalescer.do(
+        request_key(method, url, params, headers),
+        lambda: _fetch(url, method, params, headers, retries, timeout, use_cache),
+    )
+
+
+async def _fetch(
+    url: str,
+    method: str,
+    params: Optional[Dict],
+    headers: Optional[Dict],
+    retries: int,
+    timeout: int,
+    use_cache: bool,
+) -> Any:
+    request_headers = dict(headers or {})
+    cache_key = None
+    entry = None
+    if use_cache and method.upper() == "GET":
+        cache_key = http_cache.make_key(method, url, params)
+        entry = http_cache.lookup(cache_key)
+        if entry and http_cache.is_fresh(entry):
             try:
+                body = await asyncio.to_thread(http_cache.load, cache_key)
+                http_cache.stats.hits += 1
+                return json.loads(body)
+            except OSError:
+                entry = None
+        if entry:
+            request_headers.update(http_cache.conditional_headers(entry))
+
+    client = get_http_client()
+    breaker = get_breaker(urlsplit(url).netloc)
+    retry_budget.record_request()
+    attempt = 0
+    while attempt < retries:
+        trial = breaker.check()
+        retry_after = None
+        http_client_manager.track(url, 1)
+        try:
+            await rate_limiter.acquire(urlsplit(url).netloc)
+            async with http_client_manager.host_semaphore(url):
                 response = await client.request(
-                    method=method, url=url, params=params, headers=headers, timeout=timeout
+                    method=method, url=url, params=params, headers=request_headers, timeout=timeout
                 )
+            if response.status_code in RESILIENCE_CONFIG["retry_status_codes"]:
+                breaker.record_failure()
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                if attempt == retries - 1 or _waits_too_long(retry_after) or not retry_budget.try_spend():
+                    response.raise_for_status()
+            else:
+                breaker.record_success()
+                if entry is not None and response.status_code == 304:
+                    http_cache.refresh(cache_key, response.headers)
+                    try:
+                        body = await asyncio.to_thread(http_cache.load, cache_key)
+                    except OSError:
+                        # Evicted between revalidation and read: fetch it in full
+                        # right away, without using up a retry attempt.
+                        entry = None
+                        request_headers = dict(headers or {})
+                        continue
+                    http_cache.stats.revalidated += 1
+                    return json.loads(body)
                 response.raise_for_status()
+                if cache_key is not None:
+                    http_cache.stats.misses += 1
+                    if http_cache.is_cacheable(response.headers):
+                        await asyncio.to_thread(
+                            http_cache.store, cache_key, response.content, response.headers
+                        )
                 return response.json()
-            except httpx.RequestError as e:
-                if attempt < retries - 1:
-                    continue 
+        except httpx.RequestError as e:
+            breaker.record_failure()
+            if attempt == retries - 1 or not retry_budget.try_spend():
                 raise e
+        except BaseException:
+            # Cancelled before an outcome was recorded: free the half-open trial slot.
+            if trial:
+                breaker.release_trial()
+            raise
+        finally:
+            http_client_manager.track(url, -1)
+
+        delay = min(max(retry_after or 0.0, backoff_delay(attempt)), RESILIENCE_CONFIG["backoff_cap"])
+        logger.warning(f"Retrying {url} in {delay:.2f}s (attempt {attempt + 1}/{retries})")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+# Cache keys of bodies being streamed into the HTTP cache, per event loop.
+# Each future resolves to whether the body was stored (or revalidated) in full.
+_streams_in_flight: Dict[Tuple[int, str], asyncio.Future] = {}
+
+
+def _replay_cached(cache_key: str, parser: JsonArrayStreamParser, chunk_size: int = 1 << 16):
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with http_cache.open(cache_key) as f:
+        while not parser.done:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield from parser.feed(decoder.decode(chunk))
+
+
+async def _stream_response(
+    response: httpx.Response, cache_key: Optional[str], parser: JsonArrayStreamParser
+) -> AsyncIterator[Any]:
+    """
+    Parse a streamed body, writing it compressed to the HTTP cache when cacheable.
+    """
+    tmp_path = None
+    writer = None
+    if cache_key is not None and http_cache.is_cacheable(response.headers):
+        tmp_path = http_cache.writer_path(cache_key)
+        writer = gzip.open(tmp_path, "wb", compresslevel=6)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        async for chunk in response.aiter_bytes():
+            if writer is not None:
+                writer.write(chunk)
+            for item in parser.feed(decoder.decode(chunk)):
+                yield item
+            if parser.done and writer is None:
+                break
+        if writer is not None:
+            writer.close()
+            http_cache.commit(cache_key, tmp_path, response.headers)
+            writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+            os.remove(tmp_path)
+
+
+async def stream_json_items(
+    url: str,
+    array_key: str = "data",
+    predicate: Optional[Callable[[Any], bool]] = None,
+    params: Optional[Dict] = None,
+    headers: Optional[Dict] = None,
+    timeout: int = 60,
+    use_cache: bool = True,
+    retries: int = 3,
+) -> AsyncIterator[Any]:
+    """
+    Stream a JSON response and yield the items of one of its array fields.
+
+    The body is decoded incrementally (with compressed transfer negotiated), so
+    only the items accepted by ``predicate`` are ever held in memory. With
+    ``use_cache`` the raw body is written compressed to the HTTP disk cache as it
+    streams, and later runs revalidate it instead of downloading it again.
+    Requests go through the host's circuit breaker, and connection errors and
+    retryable statuses before the first item are retried like in
+    ``fetch_with_retry``: jittered backoff, Retry-After and the retry budget.
+    A cached stream of a URL that another caller is already downloading waits
+    for that download and replays it from the cache.
+
+    Args:
+        url (str): API URL to fetch data from.
+        array_key (str): Top-level key of the array to iterate. Defaults to "data".
+        predicate (Optional[Callable[[Any], bool]]): Filter applied to each item as it is parsed.
+        params (Optional[Dict]): Query parameters. Defaults to None.
+        headers (Optional[Dict]): HTTP headers. Defaults to None.
+        timeout (int): Timeout for the request in seconds. Defaults to 60.
+        use_cache (bool): Whether to use the HTTP disk cache. Defaults to True.
+        retries (int): Attempts for a request that fails before its first item. Defaults to 3.
+
+    Yields:
+        Any: Each decoded array item that passed the predicate.
+
+    Raises:
+        httpx.HTTPStatusError: If the response status is not successful.
+        CircuitOpenError: If the host's circuit breaker is open.
+    """
+    parser = JsonArrayStreamParser(array_key, predicate)
+    request_headers = {"Accept-Encoding": accept_encoding(), **(headers or {})}
+    cache_key = http_cache.make_key("GET", url, params) if use_cache else None
+    entry = http_cache.lookup(cache_key) if cache_key else None
+    if entry and http_cache.is_fresh(entry):
+        http_cache.stats.hits += 1
+        for item in _replay_cached(cache_key, parser):
+            yield item
+        return
+    flight_key = None
+    if cache_key is not None:
+        flight_key = (id(asyncio.get_running_loop()), cache_key)
+        leader = _streams_in_flight.get(flight_key)
+        if leader is not None:
+            # Another caller is already downloading this body into the cache:
+            # wait for it and replay its copy instead of downloading it again.
+            if await asyncio.shield(leader) and http_cache.lookup(cache_key) is not None:
+                http_cache.stats.hits += 1
+                for item in _replay_cached(cache_key, parser):
+                    yield item
+                return
+            entry = http_cache.lookup(cache_key)
+        if flight_key in _streams_in_flight:
+            flight_key = None
+        else:
+            _streams_in_flight[flight_key] = asyncio.get_running_loop().create_future()
+
+    cached = False
+    try:
+        if entry:
+            request_headers.update(http_cache.conditional_headers(entry))
+
+        client = get_http_client()
+        breaker = get_breaker(urlsplit(url).netloc)
+        retry_budget.record_request()
+        attempt = 0
+        while True:
+            trial = breaker.check()
+            retry_after = None
+            refetch = False
+            await rate_limiter.acquire(urlsplit(url).netloc)
+            try:
+                async with http_client_manager.host_semaphore(url):
+                    http_client_manager.track(url, 1)
+                    try:
+                        async with client.stream(
+                            "GET", url, params=params, headers=request_headers, timeout=timeout
+                        ) as response:
+                            if response.status_code in RESILIENCE_CONFIG["retry_status_codes"]:
+                                breaker.record_failure()
+                                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                                if attempt == retries - 1 or _waits_too_long(retry_after) or not retry_budget.try_spend():
+                                    response.raise_for_status()
+                            elif entry is not None and response.status_code == 304:
+                                breaker.record_success()
+                                http_cache.refresh(cache_key, response.headers)
+                                if http_cache.lookup(cache_key) is not None:
+                                    http_cache.stats.revalidated += 1
+                                    for item in _replay_cached(cache_key, parser):
+                                        yield item
+                                    cached = True
+                                    break
+                                # Evicted since the lookup: fetch it in full right
+                                # away, without using up a retry attempt.
+                                entry = None
+                                request_headers = {"Accept-Encoding": accept_encoding(), **(headers or {})}
+                                refetch = True
+                            else:
+                                breaker.record_success()
+                                response.raise_for_status()
+                                if cache_key is not None:
+                                    http_cache.stats.misses += 1
+                                async for item in _stream_response(response, cache_key, parser):
+                                    yield item
+                                cached = cache_key is not None and http_cache.is_cacheable(response.headers)
+                                break
+                    finally:
+                        http_client_manager.track(url, -1)
+            except httpx.RequestError as e:
+                breaker.record_failure()
+                # Items already handed out can't be taken back, so only a request
+                # that failed before its first item is retried, with a fresh parser.
+                if parser.kept or attempt == retries - 1 or not retry_budget.try_spend():
+                    raise e
+                parser = JsonArrayStreamParser(array_key, predicate)
+            except BaseException:
+                if trial:
+                    breaker.release_trial()
+                raise
+            if refetch:
+                continue
+
+            delay = min(max(retry_after or 0.0, backoff_delay(attempt)), RESILIENCE_CONFIG["backoff_cap"])
+            logger.warning(f"Retrying stream {url} in {delay:.2f}s (attempt {attempt + 1}/{retries})")
+            await asyncio.sleep(delay)
+            attempt += 1
+        logger.info(f"Streamed {url}: kept {parser.kept} of {parser.parsed} items")
+    finally:
+        if flight_key is not None:
+            _streams_in_flight.pop(flight_key).set_result(cached)
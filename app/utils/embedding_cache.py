@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.config.cache_config import EMBEDDING_CACHE_CONFIG
+from app.config.storage_config import STORAGE_CONFIG
+
+logger = logging.getLogger("EMBEDDING_CACHE")
+
+
+@dataclass
+class EmbeddingCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / total if total else 0.0
+
+
+class EmbeddingDiskCache:
+    """
+    SQLite table of embedding vectors keyed by content hash, stored as float32 blobs.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)")
+        return self._conn
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        if not keys:
+            return {}
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(keys))})", keys
+            ).fetchall()
+        return {key: np.frombuffer(blob, dtype=np.float32).tolist() for key, blob in rows}
+
+    def set_many(self, items: Dict[str, List[float]]) -> None:
+        if not items:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()],
+            )
+            conn.commit()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper caching vectors by model and content hash.
+
+    Lookups go through an in-memory LRU tier, then an on-disk SQLite tier,
+    and only the remaining texts are sent to the wrapped model, in one batch.
+    Documents and queries share the cache, so a query string that was
+    embedded once is never embedded again.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        max_memory_items: int = EMBEDDING_CACHE_CONFIG["max_memory_items"],
+        disk_cache: Optional[EmbeddingDiskCache] = None,
+    ):
+        self.embeddings = embeddings
+        self.model = model
+        self.max_memory_items = max_memory_items
+        self.disk_cache = disk_cache
+        self.stats = EmbeddingCacheStats()
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _lookup(self, texts: List[str]) -> Dict[str, List[float]]:
+        """
+        Return cached vectors for ``texts`` from memory, then disk, keyed by cache key.
+        """
+        keys = [self.key(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+        self.stats.memory_hits += len(found)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if self.disk_cache is not None and missing:
+            from_disk = self.disk_cache.get_many(missing)
+            self.stats.disk_hits += len(from_disk)
+            for key, vector in from_disk.items():
+                self._remember(key, vector)
+            found.update(from_disk)
+        return found
+
+    def _store(self, texts: List[str], vectors: List[List[float]]) -> None:
+        items = {self.key(text): list(vector) for text, vector in zip(texts, vectors)}
+        for key, vector in items.items():
+            self._remember(key, vector)
+        if self.disk_cache is not None:
+            self.disk_cache.set_many(items)
+
+    def _pending(self, texts: List[str], found: Dict[str, List[float]]) -> List[str]:
+        pending = list(dict.fromkeys(text for text in texts if self.key(text) not in found))
+        self.stats.misses += len(pending)
+        return pending
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        found = self._lookup(texts)
+        pending = self._pending(texts, found)
+        if pending:
+            vectors = self.embeddings.embed_documents(pending)
+            self._store(pending, vectors)
+            found.update({self.key(text): list(vector) for text, vector in zip(pending, vectors)})
+        return [found[self.key(text)] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        found = self._lookup([text])
+        if not found:
+            self.stats.misses += 1
+            vector = self.embeddings.embed_query(text)
+            self._store([text], [vector])
+            return list(vector)
+        return found[self.key(text)]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        found = await asyncio.to_thread(self._lookup, texts)
+        pending = self._pending(texts, found)
+        if pending:
+            vectors = await self.embeddings.aembed_documents(pending)
+            await asyncio.to_thread(self._store, pending, vectors)
+            found.update({self.key(text): list(vector) for text, vector in zip(pending, vectors)})
+        return [found[self.key(text)] for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        found = await asyncio.to_thread(self._lookup, [text])
+        if not found:
+            self.stats.misses += 1
+            vector = await self.embeddings.aembed_query(text)
+            await asyncio.to_thread(self._store, [text], [vector])
+            return list(vector)
+        return found[self.key(text)]
+
+
+embedding_disk_cache = EmbeddingDiskCache(os.path.join(STORAGE_CONFIG["cache_dir"], "embeddings.sqlite"))
+
+
+def get_embedding_stats(embeddings: CachedEmbeddings) -> Dict[str, float]:
+    """
+    Return hit/miss counters and the hit rate of an embedding cache.
+
+    Returns:
+        Dict[str, float]: Cache counters and ``hit_rate``.
+    """
+    return {**asdict(embeddings.stats), "hit_rate": embeddings.stats.hit_rate}
@@ -0,0 +1,259 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, asdict
+from email.utils import parsedate_to_datetime
+from typing import IO, Any, Dict, Mapping, Optional
+
+from app.config.storage_config import STORAGE_CONFIG
+
+logger = logging.getLogger("HTTP_CACHE")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+
+def _max_age(headers: Mapping[str, str]) -> Optional[int]:
+    cache_control = headers.get("cache-control", "")
+    for directive in cache_control.split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() in ("no-cache", "no-store"):
+            return None
+        if name.lower() == "max-age" and value.isdigit():
+            return int(value)
+    expires = headers.get("expires")
+    if expires:
+        try:
+            return max(0, int(parsedate_to_datetime(expires).timestamp() - time.time()))
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+class HttpCache:
+    """
+    On-disk HTTP response cache driven by ETag/Last-Modified validators.
+
+    Bodies are stored gzip-compressed, one file per request key, next to an
+    ``index.json`` holding validators, freshness and access times. When the
+    total stored size exceeds ``max_bytes`` the least recently used entries
+    are evicted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict] = None) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            params (Optional[Dict]): Query parameters.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        raw = json.dumps([method.upper(), url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @property
+    def index(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is None:
+            try:
+                with open(self._path("index.json")) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _save_index(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path("index.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self._path("index.json"))
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the index entry for a key if its body is still on disk.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Optional[Dict[str, Any]]: Entry with validators and freshness, or None.
+        """
+        entry = self.index.get(key)
+        if entry and not os.path.exists(self._path(f"{key}.gz")):
+            with self._lock:
+                self.index.pop(key, None)
+            return None
+        return entry
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        return entry.get("expires", 0) > time.time()
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Build the revalidation headers for a cached entry.
+
+        Args:
+            entry (Dict[str, Any]): Cache index entry.
+
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since headers.
+        """
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @staticmethod
+    def is_cacheable(headers: Mapping[str, str]) -> bool:
+        if "no-store" in headers.get("cache-control", "").lower():
+            return False
+        return bool(headers.get("etag") or headers.get("last-modified") or _max_age(headers))
+
+    def open(self, key: str) -> IO[bytes]:
+        """
+        Open a cached body for streaming reads, marking the entry as recently used.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            IO[bytes]: Binary file object yielding the decoded body.
+        """
+        f = gzip.open(self._path(f"{key}.gz"), "rb")
+        with self._lock:
+            if key in self.index:
+                self.index[key]["last_access"] = time.time()
+                self._save_index()
+        return f
+
+    def load(self, key: str) -> bytes:
+        """
+        Read and decompress a whole cached body.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            bytes: Decoded response body.
+        """
+        with self.open(key) as f:
+            return f.read()
+
+    def writer_path(self, key: str) -> str:
+        """
+        Return a temporary path a streamed body can be written to before ``commit``.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        return self._path(f"{key}.gz.{uuid.uuid4().hex}.tmp")
+
+    def store(self, key: str, body: bytes, headers: Mapping[str, str]) -> None:
+        """
+        Compress and store a response body together with its validators.
+
+        Args:
+            key (str): Cache key.
+            body (bytes): Decoded response body.
+            headers (Mapping[str, str]): Response headers.
+        """
+        tmp_path = self.writer_path(key)
+        with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+            f.write(body)
+        self.commit(key, tmp_path, headers)
+
+    def commit(self, key: str, tmp_path: str, headers: Mapping[str, str]) -> None:
+        """
+        Move a fully written compressed body into place and index it.
+
+        Args:
+            key (str): Cache key.
+            tmp_path (str): Path returned by ``writer_path`` holding the gzip body.
+            headers (Mapping[str, str]): Response headers.
+        """
+        os.replace(tmp_path, self._path(f"{key}.gz"))
+        with self._lock:
+            self.index[key] = {
+                "etag": headers.get("etag"),
+                "last_modified": headers.get("last-modified"),
+                "expires": time.time() + (_max_age(headers) or 0),
+                "size": os.path.getsize(self._path(f"{key}.gz")),
+                "last_access": time.time(),
+            }
+            self.stats.stores += 1
+            self._evict()
+            self._save_index()
+
+    def refresh(self, key: str, headers: Mapping[str, str]) -> None:
+        """
+        Update validators and freshness of an entry after a 304 response.
+
+        Args:
+            key (str): Cache key.
+            headers (Mapping[str, str]): Headers of the 304 response.
+        """
+        with self._lock:
+            entry = self.index.get(key)
+            if entry is None:
+                return
+            entry["etag"] = headers.get("etag") or entry.get("etag")
+            entry["last_modified"] = headers.get("last-modified") or entry.get("last_modified")
+            entry["expires"] = time.time() + (_max_age(headers) or 0)
+            self._save_index()
+
+    def _evict(self) -> None:
+        total = sum(entry["size"] for entry in self.index.values())
+        for key in sorted(self.index, key=lambda k: self.index[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= self.index.pop(key)["size"]
+            try:
+                os.remove(self._path(f"{key}.gz"))
+            except OSError:
+                pass
+            self.stats.evictions += 1
+            logger.info(f"Evicted cache entry {key}")
+
+
+http_cache = HttpCache(
+    directory=os.path.join(STORAGE_CONFIG["cache_dir"], "http"),
+    max_bytes=STORAGE_CONFIG["http_cache_max_bytes"],
+)
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """
+    Return hit/revalidate/miss counters of the HTTP disk cache.
+
+    Returns:
+        Dict[str, int]: Cache counters.
+    """
+    return asdict(http_cache.stats)
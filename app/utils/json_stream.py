@@ -0,0 +1,130 @@
+import json
+from typing import Any, Callable, List, Optional
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonArrayStreamParser:
+    """
+    Incrementally parse the items of a JSON array nested under a top-level key.
+
+    Text chunks are fed as they arrive; every complete array item is decoded
+    on its own, so memory stays bounded by the largest single item instead of
+    the whole document. Items rejected by ``predicate`` are dropped right away.
+
+    Example:
+        >>> parser = JsonArrayStreamParser("data")
+        >>> parser.feed('{"status": "success", "data": [{"a": 1}, {"a"')
+        [{'a': 1}]
+        >>> parser.feed(': 2}]}')
+        [{'a': 2}]
+    """
+
+    def __init__(self, array_key: str, predicate: Optional[Callable[[Any], bool]] = None):
+        self.predicate = predicate
+        self.parsed = 0
+        self.kept = 0
+        self.done = False
+        self._decoder = json.JSONDecoder()
+        self._key = json.dumps(array_key)[1:-1]
+        self._buffer = ""
+        self._in_array = False
+        # Scanner state for locating the top-level key before the array starts.
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string = ""
+        self._last_string: Optional[str] = None
+        self._after_key = False
+
+    def _find_array(self, chunk: str) -> Optional[int]:
+        """
+        Scan ``chunk`` for the ``[`` opening the array under the top-level key.
+
+        Only keys of the outermost object count, so a nested key with the same
+        name is skipped. State carries over between chunks.
+
+        Returns:
+            Optional[int]: Index just past the ``[``, or None if not found yet.
+        """
+        for i, char in enumerate(chunk):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = self._string if self._depth == 1 else None
+                    continue
+                if self._depth == 1 and len(self._string) <= len(self._key):
+                    self._string += char
+                continue
+            if char in _WHITESPACE:
+                continue
+            if char == "[" and self._after_key:
+                return i + 1
+            self._after_key = char == ":" and self._depth == 1 and self._last_string == self._key
+            self._last_string = None
+            if char == '"':
+                self._in_string, self._string = True, ""
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+        return None
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Feed the next chunk of text and return the items completed by it.
+
+        Args:
+            chunk (str): Next piece of the JSON document.
+
+        Returns:
+            List[Any]: Newly completed items that passed the predicate.
+        """
+        if self.done:
+            return []
+
+        if self._in_array:
+            self._buffer += chunk
+        else:
+            start = self._find_array(chunk)
+            if start is None:
+                return []
+            self._buffer = chunk[start:]
+            self._in_array = True
+
+        items: List[Any] = []
+        buffer = self._buffer
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE + ",":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self.done = True
+                pos += 1
+                break
+            try:
+                item, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            if not isinstance(item, (dict, list, str)):
+                # A bare scalar may be cut mid-token (e.g. "1." of "1.5"); only
+                # accept it once the delimiter after it has arrived.
+                delimiter = end
+                while delimiter < len(buffer) and buffer[delimiter] in _WHITESPACE:
+                    delimiter += 1
+                if delimiter >= len(buffer) or buffer[delimiter] not in ",]":
+                    break
+            pos = end
+            self.parsed += 1
+            if self.predicate is None or self.predicate(item):
+                self.kept += 1
+                items.append(item)
+
+        self._buffer = "" if self.done else buffer[pos:]
+        return items
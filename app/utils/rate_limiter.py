@@ -0,0 +1,123 @@
+import asyncio
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+from app.config.http_config import RATE_LIMITS
+
+
+@dataclass
+class RateLimiterStats:
+    acquired: int = 0
+    delayed: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class TokenBucket:
+    """
+    Async token bucket allowing ``rate`` acquisitions per second with bursts of ``burst``.
+
+    Waiters are served in FIFO order: each one reserves the next token slot
+    under a lock and then sleeps until that slot comes due, so queueing time
+    is exactly the time spent waiting for capacity.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.stats = RateLimiterStats()
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    async def acquire(self) -> float:
+        """
+        Wait for one token.
+
+        Returns:
+            float: Seconds spent queueing.
+        """
+        async with self._get_lock():
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        self.stats.acquired += 1
+        if wait > 0:
+            self.stats.delayed += 1
+            self.stats.total_wait += wait
+            self.stats.max_wait = max(self.stats.max_wait, wait)
+            await asyncio.sleep(wait)
+        return wait
+
+    async def __aenter__(self) -> "TokenBucket":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+
+class HostRateLimiter:
+    """
+    Registry of token buckets keyed by host; hosts without a limit are not throttled.
+    """
+
+    def __init__(self, limits: Dict[str, Dict[str, float]] = RATE_LIMITS):
+        self.limits = limits
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, host: str) -> Optional[TokenBucket]:
+        if host not in self.limits:
+            return None
+        if host not in self._buckets:
+            limit = self.limits[host]
+            self._buckets[host] = TokenBucket(rate=limit["rate"], burst=int(limit["burst"]))
+        return self._buckets[host]
+
+    async def acquire(self, host: str) -> float:
+        """
+        Wait for capacity on a host.
+
+        Args:
+            host (str): Host name (e.g. "yields.llama.fi").
+
+        Returns:
+            float: Seconds spent queueing (0 for unlimited hosts).
+        """
+        bucket = self.bucket(host)
+        return await bucket.acquire() if bucket else 0.0
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for host, bucket in self._buckets.items():
+            host_stats = asdict(bucket.stats)
+            host_stats["avg_wait"] = (
+                bucket.stats.total_wait / bucket.stats.acquired if bucket.stats.acquired else 0.0
+            )
+            stats[host] = host_stats
+        return stats
+
+
+rate_limiter = HostRateLimiter()
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Return per-host queueing-time metrics of the rate limiter.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Acquisitions, delayed count and wait times per host.
+    """
+    return rate_limiter.get_stats()
@@ -0,0 +1,115 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.config.storage_config import STORAGE_CONFIG
+
+
+class RecordIndex:
+    """
+    Timestamp-ordered records of one type in a SQLite table.
+
+    Records are keyed by id and ordered by Unix timestamp, so "latest",
+    "latest N" and time-range reads are index scans instead of similarity
+    searches. The newest record is pinned in memory, so repeated "latest"
+    reads do not touch the database.
+    """
+
+    def __init__(self, path: str, record_type: str):
+        self.path = path
+        self.record_type = record_type
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._latest: Optional[Dict[str, Any]] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS records "
+                "(type TEXT, key TEXT, timestamp INTEGER, record TEXT, PRIMARY KEY (type, key))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS records_by_time ON records (type, timestamp)")
+        return self._conn
+
+    def _select(self, where: str, params: tuple, limit: Optional[int] = None, newest_first: bool = True) -> List[Dict[str, Any]]:
+        sql = (
+            f"SELECT record FROM records WHERE type = ? {where} "
+            f"ORDER BY timestamp {'DESC' if newest_first else 'ASC'}, key {'DESC' if newest_first else 'ASC'}"
+        )
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        rows = self._connection().execute(sql, (self.record_type,) + params).fetchall()
+        return [json.loads(record) for record, in rows]
+
+    def add(self, key: str, timestamp: int, record: Dict[str, Any]) -> None:
+        """
+        Insert or replace a record.
+
+        Args:
+            key (str): Record id.
+            timestamp (int): Unix time the record belongs to.
+            record (Dict[str, Any]): JSON-serializable record.
+        """
+        record = {"key": key, "timestamp": timestamp, **record}
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO records (type, key, timestamp, record) VALUES (?, ?, ?, ?)",
+                (self.record_type, key, timestamp, json.dumps(record)),
+            )
+            conn.commit()
+            if self._latest is None or (timestamp, key) >= (self._latest["timestamp"], self._latest["key"]):
+                self._latest = record
+            elif self._latest["key"] == key:
+                self._latest = None
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the newest record, or None if there are none.
+        """
+        with self._lock:
+            if self._latest is None:
+                rows = self._select("", (), limit=1)
+                self._latest = rows[0] if rows else None
+            return json.loads(json.dumps(self._latest)) if self._latest is not None else None
+
+    def latest_n(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Return up to ``limit`` records, newest first.
+        """
+        with self._lock:
+            return self._select("", (), limit=limit)
+
+    def between(self, start: Optional[int] = None, end: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Return the records with ``start <= timestamp <= end``, oldest first.
+
+        Args:
+            start (Optional[int]): Unix time lower bound. Unbounded if None.
+            end (Optional[int]): Unix time upper bound. Unbounded if None.
+
+        Returns:
+            List[Dict[str, Any]]: Matching records.
+        """
+        with self._lock:
+            return self._select(
+                "AND timestamp >= ? AND timestamp <= ?",
+                (start if start is not None else -2 ** 63, end if end is not None else 2 ** 63 - 1),
+                newest_first=False,
+            )
+
+
+_indexes: Dict[str, RecordIndex] = {}
+
+
+def get_record_index(record_type: str) -> RecordIndex:
+    """
+    Return the record index of a record type, stored in ``data_dir/records.sqlite``.
+    """
+    if record_type not in _indexes:
+        _indexes[record_type] = RecordIndex(os.path.join(STORAGE_CONFIG["data_dir"], "records.sqlite"), record_type)
+    return _indexes[record_type]
@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+from app.config.http_config import RESILIENCE_CONFIG
+
+logger = logging.getLogger("RESILIENCE")
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit breaker is open."""
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = RESILIENCE_CONFIG["backoff_base"],
+    cap: float = RESILIENCE_CONFIG["backoff_cap"],
+) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt (int): Zero-based retry attempt.
+        base (float): Delay scale in seconds.
+        cap (float): Maximum delay in seconds.
+
+    Returns:
+        float: Seconds to wait, uniformly drawn from ``[0, min(cap, base * 2**attempt)]``.
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given as seconds or an HTTP date.
+
+    Args:
+        value (Optional[str]): Header value.
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if absent or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Per-dependency circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected for ``reset_timeout`` seconds; then a single trial call
+    is let through (half-open) and its outcome closes or re-opens the circuit.
+    A trial that ends without an outcome (e.g. it was cancelled) must be
+    handed back with ``release_trial`` so the next call can try again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = RESILIENCE_CONFIG["breaker_failure_threshold"],
+        reset_timeout: float = RESILIENCE_CONFIG["breaker_reset_timeout"],
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """
+        Return whether a call may proceed now.
+        """
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def check(self) -> bool:
+        """
+        Raise ``CircuitOpenError`` if the circuit rejects the call.
+
+        Returns:
+            bool: Whether the call is the half-open trial.
+        """
+        trial = self.state == "half_open"
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit for '{self.name}' is open")
+        return trial
+
+    def release_trial(self) -> None:
+        """
+        Let another trial through after one ended without recording an outcome.
+        """
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info(f"Circuit for '{self.name}' closed")
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Circuit for '{self.name}' opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """
+    Process-wide budget capping retries to a fraction of first attempts.
+
+    Each first attempt deposits ``ratio`` tokens and each retry withdraws one;
+    a small per-second allowance keeps low-traffic processes able to retry.
+    """
+
+    def __init__(
+        self,
+        ratio: float = RESILIENCE_CONFIG["retry_budget_ratio"],
+        min_per_second: float = RESILIENCE_CONFIG["retry_budget_min_per_second"],
+        max_tokens: float = 100.0,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens * ratio
+        self.rejected = 0
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.max_tokens, self.tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def record_request(self) -> None:
+        self._refill()
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Withdraw one retry token, returning False if the budget is exhausted.
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        self.rejected += 1
+        return False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+retry_budget = RetryBudget()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """
+    Return the shared circuit breaker for a host or dependency name.
+    """
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(name)
+    return _breakers[name]
+
+
+def get_resilience_stats() -> Dict[str, Any]:
+    """
+    Return circuit breaker states and retry budget counters.
+
+    Returns:
+        Dict[str, Any]: Breaker state per dependency and retry budget info.
+    """
+    return {
+        "breakers": {
+            name: {"state": breaker.state, "failures": breaker.failures}
+            for name, breaker in _breakers.items()
+        },
+        "retry_budget": {"tokens": retry_budget.tokens, "rejected": retry_budget.rejected},
+    }
+
+
+async def call_with_resilience(
+    name: str,
+    fn: Callable[[], Awaitable[Any]],
+    retries: int = 3,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+) -> Any:
+    """
+    Run a coroutine factory behind a circuit breaker with budgeted, jittered retries.
+
+    Args:
+        name (str): Dependency name selecting the circuit breaker (e.g. "pinecone").
+        fn (Callable[[], Awaitable[Any]]): Coroutine factory performing one attempt.
+        retries (int): Maximum number of attempts. Defaults to 3.
+        retry_on (Tuple[Type[BaseException], ...]): Exceptions that trigger a retry.
+
+    Returns:
+        Any: Result of the first successful attempt.
+
+    Raises:
+        CircuitOpenError: If the dependency's circuit is open.
+    """
+    breaker = get_breaker(name)
+    retry_budget.record_request()
+    for attempt in range(retries):
+        trial = breaker.check()
+        try:
+            result = await fn()
+        except retry_on as e:
+            breaker.record_failure()
+            if attempt < retries - 1 and retry_budget.try_spend():
+                delay = backoff_delay(attempt)
+                logger.warning(f"[{name}] attempt {attempt + 1} failed ({e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            raise
+        except BaseException:
+            # Cancelled or otherwise aborted: no outcome, so free the trial slot.
+            if trial:
+                breaker.release_trial()
+            raise
+        breaker.record_success()
+        return result
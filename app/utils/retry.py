@@ -1,15 +1,22 @@
 import asyncio
 from functools import wraps
-from typing import Callable, Any
+from typing import Callable, Any, Optional
 
+from app.utils.resilience import backoff_delay, get_breaker, retry_budget
 
-def retry(retries: int = 3, delay: float = 1.0):
+
+def retry(retries: int = 3, delay: float = 1.0, max_delay: float = 30.0, breaker: Optional[str] = None):
     """
     Retry decorator for async functions.
 
+    Retries wait with exponential backoff and full jitter, draw from the
+    process-wide retry budget, and optionally go through a named circuit breaker.
+
     Args:
         retries (int): Number of retry attempts. Defaults to 3.
-        delay (float): Delay between retries in seconds. Defaults to 1.0.
+        delay (float): Base delay between retries in seconds. Defaults to 1.0.
+        max_delay (float): Maximum delay between retries in seconds. Defaults to 30.0.
+        breaker (Optional[str]): Circuit breaker name (e.g. "pinecone"). Defaults to None.
 
     Returns:
         Callable: Decorated function with retry logic.
@@ -17,13 +24,27 @@ def retry(retries: int = 3, delay: float = 1.0):
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
+            circuit = get_breaker(breaker) if breaker else None
+            retry_budget.record_request()
             for attempt in range(retries):
+                trial = circuit.check() if circuit else False
                 try:
-                    return await func(*args, **kwargs)
+                    result = await func(*args, **kwargs)
                 except Exception as e:
-                    if attempt < retries - 1:
-                        await asyncio.sleep(delay)
+                    if circuit:
+                        circuit.record_failure()
+                    if attempt < retries - 1 and retry_budget.try_spend():
+                        await asyncio.sleep(backoff_delay(attempt, base=delay, cap=max_delay))
                     else:
                         raise e
+                except BaseException:
+                    # Cancelled: no outcome, so free the half-open trial slot.
+                    if trial:
+                        circuit.release_trial()
+                    raise
+                else:
+                    if circuit:
+                        circuit.record_success()
+                    return result
         return wrapper
     return decorator
@@ -0,0 +1,85 @@
+import asyncio
+import json
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    executions: int = 0
+    deduplicated: int = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight execution.
+
+    The first caller for a key starts the coroutine as its own task; callers
+    arriving while it is still running await the same task and receive the
+    same result (or exception). A cancelled caller stops waiting without
+    affecting the execution or the other callers. Tasks are tracked per
+    event loop.
+    """
+
+    def __init__(self):
+        self.stats = SingleFlightStats()
+        self._in_flight: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn`` for a key unless an identical call is already in flight.
+
+        Args:
+            key (Hashable): Identity of the call.
+            fn (Callable[[], Awaitable[Any]]): Coroutine factory to execute.
+
+        Returns:
+            Any: Result of the shared execution.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        self.stats.calls += 1
+
+        task = self._in_flight.get(flight_key)
+        if task is not None:
+            self.stats.deduplicated += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[flight_key] = task
+            self.stats.executions += 1
+            task.add_done_callback(lambda done: self._finish(flight_key, done))
+        # The execution is its own task, so cancelling one caller never cancels
+        # it or the other callers waiting on it.
+        return await asyncio.shield(task)
+
+    def _finish(self, flight_key: Tuple[int, Hashable], task: asyncio.Future) -> None:
+        if self._in_flight.get(flight_key) is task:
+            del self._in_flight[flight_key]
+        # Mark retrieved so executions whose callers all left don't trigger "never retrieved" warnings.
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, int]:
+        return asdict(self.stats)
+
+
+def request_key(
+    method: str, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None
+) -> str:
+    """
+    Build the coalescing key for an HTTP request.
+
+    Args:
+        method (str): HTTP method.
+        url (str): Request URL.
+        params (Optional[Dict]): Query parameters.
+        headers (Optional[Dict]): HTTP headers.
+
+    Returns:
+        str: Key identifying identical requests.
+    """
+    return json.dumps(
+        [method.upper(), url, sorted((params or {}).items()), sorted((headers or {}).items())],
+        default=str,
+    )
@@ -0,0 +1,167 @@
+import bisect
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def diff_snapshots(old: Dict[str, Any], new: Dict[str, Any], path: Tuple[str, ...] = ()) -> Dict[str, list]:
+    """
+    Compute the nested-dict delta turning ``old`` into ``new``.
+
+    Dicts are compared key by key; anything else is replaced whole when it is
+    not equal.
+
+    Returns:
+        Dict[str, list]: ``{"set": [[path, value], ...], "del": [path, ...]}``.
+    """
+    delta: Dict[str, list] = {"set": [], "del": []}
+    for key, value in new.items():
+        key_path = path + (key,)
+        if key in old and isinstance(value, dict) and isinstance(old[key], dict):
+            child = diff_snapshots(old[key], value, key_path)
+            delta["set"].extend(child["set"])
+            delta["del"].extend(child["del"])
+        elif key not in old or old[key] != value:
+            delta["set"].append([list(key_path), value])
+    delta["del"].extend([list(path + (key,)) for key in old if key not in new])
+    return delta
+
+
+def apply_delta(snapshot: Dict[str, Any], delta: Dict[str, list]) -> Dict[str, Any]:
+    """
+    Apply a delta from :func:`diff_snapshots` to ``snapshot`` in place.
+    """
+    for key_path in delta.get("del", []):
+        parent = snapshot
+        for key in key_path[:-1]:
+            parent = parent.get(key, {})
+        parent.pop(key_path[-1], None)
+    for key_path, value in delta.get("set", []):
+        parent = snapshot
+        for key in key_path[:-1]:
+            parent = parent.setdefault(key, {})
+        parent[key_path[-1]] = value
+    return snapshot
+
+
+class SnapshotStore:
+    """
+    Local store of JSON snapshots as periodic keyframes plus deltas.
+
+    Snapshots are split into segment files named after their keyframe's
+    timestamp. Each segment is JSON lines: one full keyframe followed by up to
+    ``keyframe_interval`` deltas holding only the changed leaves. Rebuilding a
+    snapshot reads a single segment, so it replays at most
+    ``keyframe_interval`` deltas.
+    """
+
+    def __init__(self, directory: str, keyframe_interval: int = 48, max_delta_ratio: float = 0.5):
+        self.directory = directory
+        self.keyframe_interval = keyframe_interval
+        self.max_delta_ratio = max_delta_ratio
+        self._lock = threading.Lock()
+        self._latest: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._segment: Optional[int] = None
+        self._segment_length = 0
+
+    def _segment_path(self, keyframe_timestamp: int) -> str:
+        return os.path.join(self.directory, f"{keyframe_timestamp:012d}.jsonl")
+
+    def _segments(self) -> List[int]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(int(name[:-6]) for name in os.listdir(self.directory) if name.endswith(".jsonl"))
+
+    def _replay(self, keyframe_timestamp: int, until: Optional[int] = None) -> Tuple[Optional[Tuple[int, Dict[str, Any]]], int]:
+        """
+        Rebuild the newest snapshot of a segment at or before ``until``.
+
+        Returns:
+            Tuple: ``(timestamp, snapshot)`` or None, and the number of records read.
+        """
+        state: Optional[Tuple[int, Dict[str, Any]]] = None
+        length = 0
+        with open(self._segment_path(keyframe_timestamp)) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if until is not None and record["t"] > until:
+                    break
+                length += 1
+                if "full" in record:
+                    state = (record["t"], record["full"])
+                elif state is not None:
+                    state = (record["t"], apply_delta(state[1], record))
+        return state, length
+
+    def _load_latest(self) -> None:
+        if self._latest is not None:
+            return
+        segments = self._segments()
+        if segments:
+            self._segment = segments[-1]
+            self._latest, self._segment_length = self._replay(self._segment)
+
+    def write(self, timestamp: int, snapshot: Dict[str, Any]) -> str:
+        """
+        Store a snapshot newer than the last stored one.
+
+        A keyframe is written for the first snapshot, every ``keyframe_interval``
+        deltas, and whenever a delta would exceed ``max_delta_ratio`` of the full
+        snapshot's size; otherwise only the delta is written.
+
+        Args:
+            timestamp (int): Unix time of the snapshot.
+            snapshot (Dict[str, Any]): JSON-serializable snapshot.
+
+        Returns:
+            str: ``"keyframe"``, ``"delta"`` or ``"unchanged"``.
+        """
+        snapshot = json.loads(json.dumps(snapshot))
+        with self._lock:
+            self._load_latest()
+            if self._latest is not None and timestamp <= self._latest[0]:
+                raise ValueError(f"Snapshot at {timestamp} is not newer than {self._latest[0]}")
+
+            full_line = json.dumps({"t": timestamp, "full": snapshot}, separators=(",", ":"))
+            kind, line = "keyframe", full_line
+            if self._latest is not None and self._segment_length <= self.keyframe_interval:
+                delta = diff_snapshots(self._latest[1], snapshot)
+                delta_line = json.dumps({"t": timestamp, **delta}, separators=(",", ":"))
+                if len(delta_line) <= self.max_delta_ratio * len(full_line):
+                    kind = "delta" if delta["set"] or delta["del"] else "unchanged"
+                    line = delta_line
+
+            os.makedirs(self.directory, exist_ok=True)
+            if line is full_line:
+                self._segment, self._segment_length = timestamp, 0
+            with open(self._segment_path(self._segment), "a") as f:
+                f.write(line + "\n")
+            self._segment_length += 1
+            self._latest = (timestamp, snapshot)
+        return kind
+
+    def read(self, timestamp: Optional[int] = None) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Rebuild the newest snapshot at or before ``timestamp``.
+
+        Args:
+            timestamp (Optional[int]): Unix time. Defaults to the latest snapshot.
+
+        Returns:
+            Optional[Tuple[int, Dict[str, Any]]]: The snapshot's timestamp and data, or None.
+        """
+        with self._lock:
+            if timestamp is None:
+                self._load_latest()
+                if self._latest is None:
+                    return None
+                return self._latest[0], json.loads(json.dumps(self._latest[1]))
+            segments = self._segments()
+            index = bisect.bisect_right(segments, timestamp) - 1
+            if index < 0:
+                return None
+            state, _ = self._replay(segments[index], until=timestamp)
+            return state
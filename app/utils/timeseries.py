@@ -0,0 +1,165 @@
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+
+class TimeSeriesStore:
+    """
+    Append-only local time-series store with one binary file per series.
+
+    Every record is a fixed-size row of an ``int64`` unix timestamp followed by
+    one ``float64`` per field, so files can be memory-mapped and range queries
+    are two binary searches. Appends only accept points newer than the last
+    stored timestamp, which keeps every file sorted.
+    """
+
+    def __init__(self, directory: str, fields: Sequence[str]):
+        self.directory = directory
+        self.fields = tuple(fields)
+        self.dtype = np.dtype([("timestamp", np.int64)] + [(name, np.float64) for name in self.fields])
+        self._lock = threading.Lock()
+
+    def _path(self, series_id: str) -> str:
+        return os.path.join(self.directory, f"{quote(series_id, safe='')}.bin")
+
+    def series_ids(self) -> List[str]:
+        """
+        List the ids of all stored series.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        return [unquote(name[:-4]) for name in os.listdir(self.directory) if name.endswith(".bin")]
+
+    def count(self, series_id: str) -> int:
+        try:
+            return os.path.getsize(self._path(series_id)) // self.dtype.itemsize
+        except OSError:
+            return 0
+
+    def last_timestamp(self, series_id: str) -> Optional[int]:
+        """
+        Return the newest stored timestamp of a series, or None if it is empty.
+        """
+        count = self.count(series_id)
+        if count == 0:
+            return None
+        with open(self._path(series_id), "rb") as f:
+            f.seek((count - 1) * self.dtype.itemsize)
+            return int(np.frombuffer(f.read(self.dtype.itemsize), dtype=self.dtype)["timestamp"][0])
+
+    def append(self, series_id: str, records: np.ndarray) -> int:
+        """
+        Append records newer than the last stored point.
+
+        Args:
+            series_id (str): Series identifier.
+            records (np.ndarray): Structured array with this store's ``dtype``.
+
+        Returns:
+            int: Number of records written.
+        """
+        records = np.sort(np.asarray(records, dtype=self.dtype), order="timestamp")
+        with self._lock:
+            return self._append(series_id, records)
+
+    def _append(self, series_id: str, records: np.ndarray) -> int:
+        """
+        Append sorted records newer than the last stored point; the caller holds ``_lock``.
+        """
+        last = self.last_timestamp(series_id)
+        if last is not None:
+            records = records[records["timestamp"] > last]
+        if len(records) == 0:
+            return 0
+        # Drop duplicate timestamps within the batch, keeping the last value.
+        keep = np.append(records["timestamp"][1:] != records["timestamp"][:-1], True)
+        records = records[keep]
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(series_id), "ab") as f:
+            f.write(records.tobytes())
+        return len(records)
+
+    def merge(self, series_id: str, records: np.ndarray) -> int:
+        """
+        Insert records at any position, e.g. history older than the stored points.
+
+        Timestamps already stored keep their stored values. When every record
+        is newer than the last stored point this is a plain append; otherwise
+        the series file is rewritten once.
+
+        Args:
+            series_id (str): Series identifier.
+            records (np.ndarray): Structured array with this store's ``dtype``.
+
+        Returns:
+            int: Number of records written.
+        """
+        records = np.sort(np.asarray(records, dtype=self.dtype), order="timestamp")
+        if len(records) == 0:
+            return 0
+        with self._lock:
+            last = self.last_timestamp(series_id)
+            if last is None or records["timestamp"][0] > last:
+                return self._append(series_id, records)
+            existing = self.range(series_id)
+            records = records[~np.isin(records["timestamp"], existing["timestamp"])]
+            keep = np.append(records["timestamp"][1:] != records["timestamp"][:-1], True)
+            records = records[keep]
+            if len(records) == 0:
+                return 0
+            merged = np.concatenate([existing, records])
+            merged = merged[np.argsort(merged["timestamp"], kind="stable")]
+            path = self._path(series_id)
+            with open(f"{path}.tmp", "wb") as f:
+                f.write(merged.tobytes())
+            os.replace(f"{path}.tmp", path)
+        return len(records)
+
+    def to_records(self, rows: List[Dict[str, float]]) -> np.ndarray:
+        """
+        Convert dictionaries with ``timestamp`` and field keys to a structured array.
+
+        Missing or null field values become NaN.
+        """
+        records = np.zeros(len(rows), dtype=self.dtype)
+        records["timestamp"] = [int(row["timestamp"]) for row in rows]
+        for name in self.fields:
+            records[name] = [np.nan if row.get(name) is None else float(row[name]) for row in rows]
+        return records
+
+    def append_rows(self, series_id: str, rows: List[Dict[str, float]]) -> int:
+        """
+        Append records given as dictionaries with ``timestamp`` and field keys.
+
+        Missing or null field values are stored as NaN.
+        """
+        return self.append(series_id, self.to_records(rows))
+
+    def merge_rows(self, series_id: str, rows: List[Dict[str, float]]) -> int:
+        """
+        Merge records given as dictionaries with ``timestamp`` and field keys.
+        """
+        return self.merge(series_id, self.to_records(rows))
+
+    def range(self, series_id: str, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """
+        Return the records of a series with ``start <= timestamp <= end``.
+
+        Args:
+            series_id (str): Series identifier.
+            start (Optional[int]): Inclusive lower bound (unix seconds). Defaults to the first point.
+            end (Optional[int]): Inclusive upper bound (unix seconds). Defaults to the last point.
+
+        Returns:
+            np.ndarray: Structured array of matching records (a copy, safe to keep).
+        """
+        if self.count(series_id) == 0:
+            return np.zeros(0, dtype=self.dtype)
+        data = np.memmap(self._path(series_id), dtype=self.dtype, mode="r")
+        timestamps = data["timestamp"]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        hi = len(data) if end is None else int(np.searchsorted(timestamps, end, side="right"))
+        return np.array(data[lo:hi])
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger("TTL_CACHE")
+
+
+@dataclass
+class TTLCacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+
+class TTLCache:
+    """
+    In-memory TTL cache with stale-while-revalidate semantics.
+
+    Values younger than ``ttl`` are returned directly. Values older than that
+    but within ``ttl + stale_ttl`` are returned immediately while a single
+    background task refreshes them. Anything older is fetched inline.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stats = TTLCacheStats()
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float = 0,
+    ) -> Any:
+        """
+        Return the cached value for a key, fetching or refreshing it as needed.
+
+        Args:
+            key (Hashable): Cache key.
+            fetcher (Callable[[], Awaitable[Any]]): Coroutine factory producing a fresh value.
+            ttl (float): Seconds a value is considered fresh.
+            stale_ttl (float): Extra seconds a stale value may be served while refreshing.
+
+        Returns:
+            Any: Cached or freshly fetched value.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < ttl:
+                self.stats.hits += 1
+                return value
+            if age < ttl + stale_ttl:
+                self.stats.stale_hits += 1
+                self._schedule_refresh(key, fetcher)
+                return value
+
+        self.stats.misses += 1
+        value = await fetcher()
+        self._entries[key] = (value, time.monotonic())
+        return value
+
+    def _schedule_refresh(self, key: Hashable, fetcher: Callable[[], Awaitable[Any]]) -> None:
+        task = self._refreshing.get(key)
+        # A task left pending by an event loop that has since closed (e.g. a
+        # finished ``asyncio.run``) will never complete, so it doesn't count.
+        if task is not None and not task.done() and not task.get_loop().is_closed():
+            return
+        task = asyncio.get_running_loop().create_task(self._refresh(key, fetcher))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda done: self._refresh_done(key, done))
+
+    def _refresh_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._refreshing.get(key) is task:
+            del self._refreshing[key]
+
+    async def _refresh(self, key: Hashable, fetcher: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            self._entries[key] = (await fetcher(), time.monotonic())
+            self.stats.refreshes += 1
+        except Exception as e:
+            self.stats.refresh_errors += 1
+            logger.warning(f"[{self.name}] Background refresh failed for {key}: {e}")
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        return asdict(self.stats)
@@ -0,0 +1,417 @@
+import asyncio
+import heapq
+import json
+import os
+import threading
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+
+def matches_filter(metadata: Dict[str, Any], filter: Optional[Dict[str, Any]]) -> bool:
+    """
+    Evaluate a Pinecone-style metadata filter.
+
+    Supports plain equality, ``$eq``, ``$ne``, ``$gt``, ``$gte``, ``$lt``,
+    ``$lte``, ``$in``, ``$nin``, ``$exists``, and ``$and``/``$or`` lists.
+    """
+    if not filter:
+        return True
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, sub) for sub in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches_filter(metadata, sub) for sub in condition):
+                return False
+            continue
+        value = metadata.get(key)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, arg in condition.items():
+            try:
+                ok = {
+                    "$eq": lambda: value == arg,
+                    "$ne": lambda: value != arg,
+                    "$gt": lambda: value is not None and value > arg,
+                    "$gte": lambda: value is not None and value >= arg,
+                    "$lt": lambda: value is not None and value < arg,
+                    "$lte": lambda: value is not None and value <= arg,
+                    "$in": lambda: value in arg,
+                    "$nin": lambda: value not in arg,
+                    "$exists": lambda: (key in metadata) == bool(arg),
+                }[op]()
+            except TypeError:
+                ok = False
+            except KeyError:
+                raise ValueError(f"Unsupported filter operator: {op}")
+            if not ok:
+                return False
+    return True
+
+
+class LocalVectorIndex:
+    """
+    In-process cosine-similarity index persisted to a memory-mapped file.
+
+    Vectors are L2-normalised float32 rows appended to ``vectors.f32`` and
+    read through ``np.memmap``; ids, metadata and texts are an append-only
+    JSON-lines log replayed on load. Updates overwrite their row in place and
+    deletes leave a tombstone until ``compact``.
+
+    Up to ``brute_force_max`` live vectors, queries are one matrix-vector
+    product. Above that, an HNSW-style navigable small-world graph (single
+    layer, ``graph_degree`` neighbours per node, beam search of width
+    ``ef_search``) answers queries approximately; it is built on first use,
+    maintained on insert and saved to ``graph.npy``.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        dimension: int,
+        brute_force_max: int = 20000,
+        graph_degree: int = 16,
+        ef_construction: int = 64,
+        ef_search: int = 64,
+    ):
+        self.directory = directory
+        self.dimension = dimension
+        self.brute_force_max = brute_force_max
+        self.graph_degree = graph_degree
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._lock = threading.RLock()
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._metadata: List[Dict[str, Any]] = []
+        self._texts: List[str] = []
+        self._vectors: np.ndarray = np.zeros((0, dimension), dtype=np.float32)
+        self._graph: Optional[List[List[int]]] = None
+        self._entry: Optional[int] = None
+        self._load()
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.f32")
+
+    @property
+    def _log_path(self) -> str:
+        return os.path.join(self.directory, "records.jsonl")
+
+    @property
+    def _graph_path(self) -> str:
+        return os.path.join(self.directory, "graph.npy")
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _map_vectors(self) -> None:
+        rows = os.path.getsize(self._vectors_path) // (4 * self.dimension) if os.path.exists(self._vectors_path) else 0
+        if rows == 0:
+            self._vectors = np.zeros((0, self.dimension), dtype=np.float32)
+        else:
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dimension))
+
+    def _load(self) -> None:
+        if os.path.exists(self._log_path):
+            with open(self._log_path) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record.get("deleted"):
+                        row = self._rows.pop(record["id"], None)
+                        if row is not None:
+                            self._ids[row] = None
+                        continue
+                    row = record["row"]
+                    if row == len(self._ids):
+                        self._ids.append(record["id"])
+                        self._metadata.append(record["metadata"])
+                        self._texts.append(record["text"])
+                    else:
+                        self._ids[row] = record["id"]
+                        self._metadata[row] = record["metadata"]
+                        self._texts[row] = record["text"]
+                    self._rows[record["id"]] = row
+        self._map_vectors()
+        if os.path.exists(self._graph_path):
+            graph = np.load(self._graph_path)
+            if len(graph) == len(self._ids):
+                self._graph = [[int(n) for n in row if n >= 0] for row in graph]
+                self._entry = next((row for row in self._rows.values()), None)
+
+    def _normalise(self, vectors: Sequence[Sequence[float]]) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1)
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+        texts: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        Insert or overwrite records.
+
+        Args:
+            ids (Sequence[str]): Record ids.
+            vectors (Sequence[Sequence[float]]): Embeddings, one per id.
+            metadatas (Optional[Sequence[Dict[str, Any]]]): Metadata per id.
+            texts (Optional[Sequence[str]]): Source text per id.
+        """
+        vectors = self._normalise(vectors)
+        metadatas = list(metadatas or [{} for _ in ids])
+        texts = list(texts or ["" for _ in ids])
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            latest = {record_id: i for i, record_id in enumerate(ids)}
+            updates = [(self._rows[record_id], i) for record_id, i in latest.items() if record_id in self._rows]
+            inserts = [(record_id, i) for record_id, i in latest.items() if record_id not in self._rows]
+
+            log_lines = []
+            if updates:
+                data = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=self._vectors.shape)
+                for row, i in updates:
+                    data[row] = vectors[i]
+                    self._metadata[row], self._texts[row] = metadatas[i], texts[i]
+                    log_lines.append({"id": ids[i], "row": row, "metadata": metadatas[i], "text": texts[i]})
+                data.flush()
+                del data
+
+            first_new = len(self._ids)
+            if inserts:
+                with open(self._vectors_path, "ab") as f:
+                    f.write(np.ascontiguousarray(vectors[[i for _, i in inserts]]).tobytes())
+                for offset, (record_id, i) in enumerate(inserts):
+                    row = first_new + offset
+                    self._ids.append(record_id)
+                    self._metadata.append(metadatas[i])
+                    self._texts.append(texts[i])
+                    self._rows[record_id] = row
+                    log_lines.append({"id": record_id, "row": row, "metadata": metadatas[i], "text": texts[i]})
+
+            with open(self._log_path, "a") as f:
+                f.writelines(json.dumps(line) + "\n" for line in log_lines)
+            self._map_vectors()
+
+            if self._graph is not None:
+                for row in range(first_new, len(self._ids)):
+                    self._graph_insert(row)
+                self._save_graph()
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """
+        Delete records by id.
+
+        Returns:
+            int: Number of records that existed.
+        """
+        with self._lock:
+            deleted = [record_id for record_id in ids if record_id in self._rows]
+            if not deleted:
+                return 0
+            for record_id in deleted:
+                self._ids[self._rows.pop(record_id)] = None
+            with open(self._log_path, "a") as f:
+                f.writelines(json.dumps({"id": record_id, "deleted": True}) + "\n" for record_id in deleted)
+            if len(self._ids) - len(self._rows) > max(len(self._rows), 1000):
+                self.compact()
+            return len(deleted)
+
+    def fetch(self, ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up records by id.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: ``{"id", "metadata", "text", "values"}`` per id found.
+        """
+        with self._lock:
+            return {
+                record_id: self._record(self._rows[record_id])
+                for record_id in ids
+                if record_id in self._rows
+            }
+
+    def _record(self, row: int) -> Dict[str, Any]:
+        return {
+            "id": self._ids[row],
+            "metadata": self._metadata[row],
+            "text": self._texts[row],
+            "values": np.array(self._vectors[row]).tolist(),
+        }
+
+    def query(
+        self, vector: Sequence[float], k: int = 5, filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Return the ``k`` records most similar to ``vector`` that match ``filter``.
+
+        Args:
+            vector (Sequence[float]): Query embedding.
+            k (int): Number of results. Defaults to 5.
+            filter (Optional[Dict[str, Any]]): Pinecone-style metadata filter.
+
+        Returns:
+            List[Tuple[Dict[str, Any], float]]: Records and cosine similarities, best first.
+        """
+        query = self._normalise(vector)[0]
+        with self._lock:
+            if filter:
+                candidates = np.array(
+                    [row for row in self._rows.values() if matches_filter(self._metadata[row], filter)],
+                    dtype=np.intp,
+                )
+            else:
+                candidates = None
+
+            if len(self._rows) <= self.brute_force_max or (
+                candidates is not None and len(candidates) <= self.brute_force_max
+            ):
+                rows = candidates if candidates is not None else np.fromiter(self._rows.values(), dtype=np.intp)
+                if len(rows) == 0:
+                    return []
+                scores = self._vectors[rows] @ query
+                top = np.argsort(-scores, kind="stable")[:k]
+                return [(self._record(int(rows[i])), float(scores[i])) for i in top]
+
+            if self._graph is None:
+                self._build_graph()
+            allowed = set(candidates.tolist()) if candidates is not None else None
+            ef = max(self.ef_search, k) * (4 if allowed is not None else 1)
+            results = [
+                (row, score)
+                for row, score in self._graph_search(query, ef)
+                if self._ids[row] is not None and (allowed is None or row in allowed)
+            ]
+            return [(self._record(row), score) for row, score in results[:k]]
+
+    def _graph_search(self, query: np.ndarray, ef: int) -> List[Tuple[int, float]]:
+        if self._entry is None:
+            return []
+        entry_score = float(self._vectors[self._entry] @ query)
+        visited = {self._entry}
+        candidates = [(-entry_score, self._entry)]
+        best = [(entry_score, self._entry)]
+        while candidates:
+            negative_score, row = heapq.heappop(candidates)
+            if len(best) >= ef and -negative_score < best[0][0]:
+                break
+            neighbours = [n for n in self._graph[row] if n not in visited]
+            if not neighbours:
+                continue
+            visited.update(neighbours)
+            scores = self._vectors[neighbours] @ query
+            for neighbour, score in zip(neighbours, scores.tolist()):
+                if len(best) < ef or score > best[0][0]:
+                    heapq.heappush(candidates, (-score, neighbour))
+                    heapq.heappush(best, (score, neighbour))
+                    if len(best) > ef:
+                        heapq.heappop(best)
+        return [(row, score) for score, row in sorted(best, reverse=True)]
+
+    def _graph_insert(self, row: int) -> None:
+        self._graph.append([])
+        if self._entry is None:
+            self._entry = row
+            return
+        vector = np.asarray(self._vectors[row])
+        found = self._graph_search(vector, self.ef_construction)
+        neighbours = [n for n, _ in found if n != row][: self.graph_degree]
+        self._graph[row] = neighbours
+        for neighbour in neighbours:
+            links = self._graph[neighbour]
+            links.append(row)
+            if len(links) > self.graph_degree:
+                scores = self._vectors[links] @ np.asarray(self._vectors[neighbour])
+                self._graph[neighbour] = [links[i] for i in np.argsort(-scores)[: self.graph_degree]]
+
+    def _build_graph(self) -> None:
+        self._graph, self._entry = [], None
+        for row in range(len(self._ids)):
+            self._graph_insert(row)
+        self._save_graph()
+
+    def _save_graph(self) -> None:
+        graph = np.full((len(self._graph), self.graph_degree), -1, dtype=np.int32)
+        for row, links in enumerate(self._graph):
+            graph[row, : len(links)] = links[: self.graph_degree]
+        tmp_path = f"{self._graph_path}.tmp.npy"
+        np.save(tmp_path, graph)
+        os.replace(tmp_path, self._graph_path)
+
+    def compact(self) -> None:
+        """
+        Rewrite the files without deleted rows.
+        """
+        with self._lock:
+            live = sorted(self._rows.values())
+            vectors = np.array(self._vectors[live]) if live else np.zeros((0, self.dimension), dtype=np.float32)
+            records = [
+                {"id": self._ids[row], "row": i, "metadata": self._metadata[row], "text": self._texts[row]}
+                for i, row in enumerate(live)
+            ]
+            with open(f"{self._vectors_path}.tmp", "wb") as f:
+                f.write(vectors.tobytes())
+            with open(f"{self._log_path}.tmp", "w") as f:
+                f.writelines(json.dumps(record) + "\n" for record in records)
+            self._vectors = np.zeros((0, self.dimension), dtype=np.float32)
+            os.replace(f"{self._vectors_path}.tmp", self._vectors_path)
+            os.replace(f"{self._log_path}.tmp", self._log_path)
+            if os.path.exists(self._graph_path):
+                os.remove(self._graph_path)
+            self._ids = [record["id"] for record in records]
+            self._metadata = [record["metadata"] for record in records]
+            self._texts = [record["text"] for record in records]
+            self._rows = {record_id: i for i, record_id in enumerate(self._ids)}
+            self._graph, self._entry = None, None
+            self._map_vectors()
+
+
+class LocalVectorStore:
+    """
+    ``LocalVectorIndex`` behind the subset of the LangChain vector store API
+    that ``VectorStoreService`` uses, so it can stand in for ``PineconeVectorStore``.
+    """
+
+    def __init__(self, embedding: Embeddings, index: LocalVectorIndex, text_key: str = "text"):
+        self.embedding = embedding
+        self.index = index
+        self.text_key = text_key
+
+    async def aadd_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        embedding_chunk_size: int = 1000,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        ids = list(ids) if ids is not None else [str(uuid.uuid4()) for _ in texts]
+        metadatas = metadatas or [{} for _ in texts]
+        for start in range(0, len(texts), embedding_chunk_size):
+            chunk = slice(start, start + embedding_chunk_size)
+            vectors = await self.embedding.aembed_documents(texts[chunk])
+            await asyncio.to_thread(self.index.upsert, ids[chunk], vectors, metadatas[chunk], texts[chunk])
+        return ids
+
+    async def asimilarity_search_with_score(
+        self, query: str, k: int = 4, filter: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        vector = await self.embedding.aembed_query(query)
+        results = await asyncio.to_thread(self.index.query, vector, k, filter)
+        return [
+            (Document(page_content=record["text"], metadata=record["metadata"]), score)
+            for record, score in results
+        ]
+
+    async def adelete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> None:
+        await asyncio.to_thread(self.index.delete, ids or [])
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger("WRITE_BUFFER")
+
+
+@dataclass
+class WriteBufferStats:
+    added: int = 0
+    coalesced: int = 0
+    flushes: int = 0
+    flushed: int = 0
+    flush_errors: int = 0
+
+
+class WriteBuffer:
+    """
+    Write-behind buffer handing records to a bulk writer in batches.
+
+    Records are keyed, so a newer record replaces a pending one with the same
+    key. The buffer flushes when it holds ``max_records`` records, every
+    ``flush_interval`` seconds while records are pending, and on ``close``.
+    A failed flush puts its records back (unless newer ones replaced them)
+    for the next attempt.
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[List[Any]], Awaitable[Any]],
+        max_records: int,
+        flush_interval: float,
+    ):
+        self.writer = writer
+        self.max_records = max_records
+        self.flush_interval = flush_interval
+        self.stats = WriteBufferStats()
+        self._pending: Dict[Hashable, Any] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._timer: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the pending record for a key, or None if nothing is pending for it.
+        """
+        return self._pending.get(key)
+
+    async def add(self, key: Hashable, record: Any) -> None:
+        """
+        Queue a record, flushing right away if the buffer is full.
+        """
+        if key in self._pending:
+            self.stats.coalesced += 1
+        self._pending[key] = record
+        self.stats.added += 1
+        if len(self._pending) >= self.max_records:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Scheduled flush failed: {e}")
+
+    async def flush(self) -> int:
+        """
+        Write every pending record in one call to the writer.
+
+        Returns:
+            int: Number of records written.
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            try:
+                await self.writer(list(batch.values()))
+            except Exception:
+                self.stats.flush_errors += 1
+                self._pending = {**batch, **self._pending}
+                raise
+            self.stats.flushes += 1
+            self.stats.flushed += len(batch)
+            return len(batch)
+
+    async def close(self) -> None:
+        """
+        Cancel the interval timer and flush what is left.
+        """
+        if self._timer is not None and not self._timer.done() and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        await self.flush()
+        self._flush_lock = None
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**asdict(self.stats), "pending": len(self._pending)}
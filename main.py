@@ -1,6 +1,8 @@
 import asyncio
 import uuid
 from app.graph import create_graph 
+from app.services.vector_service import VectorService
+from app.utils.api_client import close_http_client
 
 async def main():
     graph = create_graph()
@@ -21,21 +23,25 @@ async def main():
         }
     }
     
-    async for chunk in graph.astream(
-        initial_state, 
-        config=config,
-        stream_mode="values"
-    ):
-        if 'strategy_signals' in chunk:
-            try:
-                if isinstance(chunk['strategy_signals'], dict):
-                    strategy = chunk['strategy_signals'].get('content')
-                    if strategy:
-                        print(strategy)
-                else:
-                    print(chunk['strategy_signals'])
-            except Exception as e:
-                print(f"Error processing chunk: {chunk}")
+    try:
+        async for chunk in graph.astream(
+            initial_state, 
+            config=config,
+            stream_mode="values"
+        ):
+            if 'strategy_signals' in chunk:
+                try:
+                    if isinstance(chunk['strategy_signals'], dict):
+                        strategy = chunk['strategy_signals'].get('content')
+                        if strategy:
+                            print(strategy)
+                    else:
+                        print(chunk['strategy_signals'])
+                except Exception as e:
+                    print(f"Error processing chunk: {chunk}")
+    finally:
+        await VectorService.flush()
+        await close_http_client()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file